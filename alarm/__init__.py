@@ -1,5 +1,6 @@
 """Alarm module for scheduled music playback."""
 
+import os
 from pathlib import Path
 
 # Base paths
@@ -7,3 +8,8 @@ ALARM_DIR = Path(__file__).parent
 PROJECT_DIR = ALARM_DIR.parent
 MUSIC_DIR = PROJECT_DIR / "music"
 CONFIG_FILE = PROJECT_DIR / "data" / "alarm_config.json"
+
+# mpv IPC socket, shared with the web app so it can stop playback. Both
+# service files set MPV_SOCKET, and the default does not depend on the
+# user or environment, so processes started without it still agree
+MPV_SOCKET = Path(os.environ.get("MPV_SOCKET", PROJECT_DIR / "data" / "health-dashboard-mpv.sock"))
@@ -1,59 +1,79 @@
 """Display power control using wlopm (Wayland Output Power Management)."""
 
+import logging
 import subprocess
+import time
 from typing import Optional
 
+logger = logging.getLogger(__name__)
 
-def display_on() -> bool:
+# How long (seconds) to wait for wlopm before giving up on it
+WLOPM_TIMEOUT = 2
+
+# Last known display state and when it was recorded (monotonic seconds)
+STATE_CACHE_TTL = 1.0
+_cached_state: Optional[bool] = None
+_cached_state_at: float = 0.0
+
+
+def _remember_state(state: bool):
+    """Record the display state so get_display_state can skip wlopm briefly."""
+    global _cached_state, _cached_state_at
+    _cached_state = state
+    _cached_state_at = time.monotonic()
+
+
+def _set_power(state: bool) -> bool:
     """
-    Turn on the display.
+    Switch display power with wlopm without capturing its output.
     
     Returns True if successful, False otherwise.
     """
+    action = "on" if state else "off"
     try:
-        result = subprocess.run(
-            ["wlopm", "--on", "*"],
-            capture_output=True,
-            timeout=5
+        proc = subprocess.Popen(
+            ["wlopm", f"--{action}", "*"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
-        if result.returncode == 0:
-            print("[Display] Display turned ON")
+        try:
+            returncode = proc.wait(timeout=WLOPM_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            logger.error("[Display] Timed out turning %s display", action)
+            return False
+        if returncode == 0:
+            _remember_state(state)
+            logger.info("[Display] Display turned %s", action.upper())
             return True
         else:
-            print(f"[Display] Failed to turn on: {result.stderr.decode()}")
+            logger.error("[Display] Failed to turn %s: wlopm exited with %s", action, returncode)
             return False
     except FileNotFoundError:
-        print("[Display] Error: wlopm not installed. Run: sudo apt install wlopm")
+        logger.error("[Display] Error: wlopm not installed. Run: sudo apt install wlopm")
         return False
     except Exception as e:
-        print(f"[Display] Error turning on display: {e}")
+        logger.error("[Display] Error turning %s display: %s", action, e)
         return False
 
 
+def display_on() -> bool:
+    """
+    Turn on the display.
+    
+    Returns True if successful, False otherwise.
+    """
+    return _set_power(True)
+
+
 def display_off() -> bool:
     """
     Turn off the display.
     
     Returns True if successful, False otherwise.
     """
-    try:
-        result = subprocess.run(
-            ["wlopm", "--off", "*"],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            print("[Display] Display turned OFF")
-            return True
-        else:
-            print(f"[Display] Failed to turn off: {result.stderr.decode()}")
-            return False
-    except FileNotFoundError:
-        print("[Display] Error: wlopm not installed. Run: sudo apt install wlopm")
-        return False
-    except Exception as e:
-        print(f"[Display] Error turning off display: {e}")
-        return False
+    return _set_power(False)
 
 
 def get_display_state() -> Optional[bool]:
@@ -62,19 +82,32 @@ def get_display_state() -> Optional[bool]:
     
     Returns True if on, False if off, None if unknown.
     """
+    if (
+        _cached_state is not None
+        and time.monotonic() - _cached_state_at < STATE_CACHE_TTL
+    ):
+        return _cached_state
+    
     try:
         result = subprocess.run(
             ["wlopm"],
             capture_output=True,
-            text=True,
-            timeout=5
+            timeout=WLOPM_TIMEOUT
         )
         if result.returncode == 0:
-            # wlopm output format: "HDMI-A-1 on" or "HDMI-A-1 off"
-            output = result.stdout.strip().lower()
-            if " on" in output:
-                return True
-            elif " off" in output:
+            # wlopm prints one line per output: "HDMI-A-1 on" or "DP-1 off".
+            # Check each line's last token on the raw bytes; the display
+            # counts as on if any output is on.
+            any_off = False
+            for line in result.stdout.splitlines():
+                line = line.rstrip()
+                if line.endswith(b" on"):
+                    _remember_state(True)
+                    return True
+                if line.endswith(b" off"):
+                    any_off = True
+            if any_off:
+                _remember_state(False)
                 return False
         return None
     except Exception:
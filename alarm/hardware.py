@@ -1,25 +1,29 @@
 """Hardware controls for alarm: button and volume potentiometer."""
 
+import logging
+import re
 import subprocess
 import threading
 import time
 from typing import Callable, Optional
 
-# Hardware available flag
-HARDWARE_AVAILABLE = False
+logger = logging.getLogger(__name__)
+
+# amixer volume arguments ("0%".."100%"), built once for the fallback path
+_VOL_STRS = tuple(f"{i}%" for i in range(101))
+
+# Volume percentage in amixer output, e.g. "Playback 42598 [65%] [on]"
+_AMIXER_PERCENT_RE = re.compile(r"\[(\d+)%\]")
+
+# ALSA mixer binding available flag (falls back to amixer subprocess)
+ALSA_AVAILABLE = False
 
 try:
-    from gpiozero import Button
-    import board
-    import busio
-    import adafruit_ads1x15.ads1115 as ADS
-    from adafruit_ads1x15.analog_in import AnalogIn
+    import alsaaudio
 
-    HARDWARE_AVAILABLE = True
+    ALSA_AVAILABLE = True
 except ImportError as e:
-    print(f"[Hardware] Libraries not available: {e}")
-except Exception as e:
-    print(f"[Hardware] Error loading libraries: {e}")
+    logger.warning("[Hardware] alsaaudio not available, using amixer: %s", e)
 
 
 class HardwareController:
@@ -31,8 +35,23 @@ class HardwareController:
     # Volume update threshold (percent) - only update if change exceeds this
     VOLUME_THRESHOLD = 3
 
-    # Polling interval for potentiometer (seconds)
-    POLL_INTERVAL = 0.1
+    # Extra margin (percent) on top of the threshold so readings sitting on
+    # a boundary don't flip the volume back and forth
+    VOLUME_HYSTERESIS = 1
+
+    # Smoothing factor for the potentiometer moving average (0-1, higher
+    # follows the knob faster but passes through more ADC noise)
+    EMA_ALPHA = 0.3
+
+    # Adaptive polling intervals for potentiometer (seconds): poll fast
+    # while the knob is being turned, back off as it sits idle
+    POLL_INTERVAL_ACTIVE = 0.05
+    POLL_INTERVAL_SETTLING = 0.25
+    POLL_INTERVAL_IDLE = 1.0
+
+    # Idle time (seconds) before switching to the next slower interval
+    SETTLING_AFTER = 1
+    IDLE_AFTER = 10
 
     def __init__(self, on_button_press: Callable[[], None]):
         """
@@ -43,16 +62,38 @@ class HardwareController:
         """
         self._on_button_press = on_button_press
         self._running = False
+        self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._last_volume = -1  # Track last set volume to avoid redundant calls
+        self._ema: Optional[float] = None  # Smoothed potentiometer reading
 
-        self._button: Optional[Button] = None
-        self._pot: Optional[AnalogIn] = None
+        self._button: Optional["Button"] = None
+        self._pot: Optional["AnalogIn"] = None
+        self._mixer: Optional["alsaaudio.Mixer"] = None
 
-        if not HARDWARE_AVAILABLE:
-            print(
-                "[Hardware] Hardware libraries not available, running in software-only mode"
-            )
+        if ALSA_AVAILABLE:
+            try:
+                # Keep one mixer handle open so volume changes are a single ioctl
+                self._mixer = alsaaudio.Mixer("Master")
+                logger.info("[Hardware] ALSA mixer opened (Master)")
+            except alsaaudio.ALSAAudioError as e:
+                logger.warning("[Hardware] Could not open ALSA mixer, using amixer: %s", e)
+
+        # Hardware libraries are imported here rather than at module load:
+        # they probe GPIO/I2C on import, which slows every startup even
+        # when running in software-only mode
+        try:
+            from gpiozero import Button
+            import board
+            import busio
+            import adafruit_ads1x15.ads1115 as ADS
+            from adafruit_ads1x15.ads1x15 import Mode
+            from adafruit_ads1x15.analog_in import AnalogIn
+        except ImportError as e:
+            logger.warning("[Hardware] Libraries not available, running in software-only mode: %s", e)
+            return
+        except Exception as e:
+            logger.error("[Hardware] Error loading libraries, running in software-only mode: %s", e)
             return
 
         try:
@@ -62,24 +103,34 @@ class HardwareController:
                 self.BUTTON_GPIO, pull_up=True, bounce_time=0.2  # 200ms debounce
             )
             self._button.when_pressed = self._handle_button_press
-            print(f"[Hardware] Button initialized on GPIO {self.BUTTON_GPIO}")
+            logger.info("[Hardware] Button initialized on GPIO %s", self.BUTTON_GPIO)
 
             # Initialize ADS1115 ADC on I2C
             i2c = busio.I2C(board.SCL, board.SDA)
             ads = ADS.ADS1115(i2c)
             # Set gain for 0-4.096V range (works well with 3.3V logic)
             ads.gain = 1
+            # Continuous conversion: each read is a single register read
+            # instead of trigger + ~8ms conversion wait + read
+            ads.mode = Mode.CONTINUOUS
+            ads.data_rate = 860  # Fastest rate (samples per second)
             self._pot = AnalogIn(ads, 0)  # Channel A0
-            print("[Hardware] ADS1115 ADC initialized on I2C (channel A0)")
+            # First read starts the continuous conversion on channel A0
+            _ = self._pot.value
+            logger.info("[Hardware] ADS1115 ADC initialized on I2C (channel A0, continuous)")
+
+            # Start from the current system volume so the first pot reading
+            # only triggers a set if it actually differs
+            self._last_volume = self._read_system_volume()
 
         except Exception as e:
-            print(f"[Hardware] Error initializing hardware: {e}")
+            logger.error("[Hardware] Error initializing hardware: %s", e)
             self._button = None
             self._pot = None
 
     def _handle_button_press(self):
         """Handle button press event."""
-        print("[Hardware] Stop button pressed")
+        logger.info("[Hardware] Stop button pressed")
         if self._on_button_press:
             self._on_button_press()
 
@@ -97,16 +148,48 @@ class HardwareController:
             # ADS1115 returns 16-bit signed value (0 to 32767 for positive voltages)
             # Map to 0-100 percent
             raw_value = self._pot.value
+            sample = raw_value / 327.67
+            # Exponential moving average to filter ADC jitter
+            if self._ema is None:
+                self._ema = sample
+            else:
+                self._ema = self.EMA_ALPHA * sample + (1 - self.EMA_ALPHA) * self._ema
             # Clamp to valid range and convert
-            percent = max(0, min(100, int(raw_value / 327.67)))
+            percent = max(0, min(100, int(self._ema)))
             return percent
         except Exception as e:
-            print(f"[Hardware] Error reading potentiometer: {e}")
+            logger.error("[Hardware] Error reading potentiometer: %s", e)
+            return -1
+
+    def _read_system_volume(self) -> int:
+        """
+        Read the current system volume.
+
+        Returns:
+            Volume percentage, or -1 if it couldn't be read
+        """
+        if self._mixer is not None:
+            try:
+                return self._mixer.getvolume()[0]
+            except alsaaudio.ALSAAudioError:
+                pass
+
+        try:
+            result = subprocess.run(
+                ["amixer", "sget", "Master"],
+                capture_output=True,
+                text=True,
+                timeout=1,
+            )
+        except (subprocess.TimeoutExpired, OSError):
             return -1
 
+        match = _AMIXER_PERCENT_RE.search(result.stdout)
+        return int(match.group(1)) if match else -1
+
     def set_system_volume(self, percent: int) -> bool:
         """
-        Set system volume using amixer.
+        Set system volume via the ALSA mixer, falling back to amixer.
 
         Args:
             percent: Volume level 0-100
@@ -116,21 +199,28 @@ class HardwareController:
         """
         percent = max(0, min(100, percent))
 
+        if self._mixer is not None:
+            try:
+                self._mixer.setvolume(percent)
+                return True
+            except alsaaudio.ALSAAudioError as e:
+                logger.warning("[Hardware] ALSA mixer error, falling back to amixer: %s", e)
+
         try:
             result = subprocess.run(
-                ["amixer", "set", "Master", f"{percent}%"],
+                ["amixer", "set", "Master", _VOL_STRS[percent]],
                 capture_output=True,
                 timeout=2,
             )
             return result.returncode == 0
         except subprocess.TimeoutExpired:
-            print("[Hardware] amixer timed out")
+            logger.error("[Hardware] amixer timed out")
             return False
         except FileNotFoundError:
             # Try with card specification
             try:
                 result = subprocess.run(
-                    ["amixer", "-c", "0", "set", "Master", f"{percent}%"],
+                    ["amixer", "-c", "0", "set", "Master", _VOL_STRS[percent]],
                     capture_output=True,
                     timeout=2,
                 )
@@ -138,31 +228,51 @@ class HardwareController:
             except Exception:
                 return False
         except Exception as e:
-            print(f"[Hardware] Error setting volume: {e}")
+            logger.error("[Hardware] Error setting volume: %s", e)
             return False
 
+    def _poll_interval(self, idle: float) -> float:
+        """Choose the polling interval for the time since the last change."""
+        if idle < self.SETTLING_AFTER:
+            return self.POLL_INTERVAL_ACTIVE
+        if idle < self.IDLE_AFTER:
+            return self.POLL_INTERVAL_SETTLING
+        return self.POLL_INTERVAL_IDLE
+
     def _poll_loop(self):
         """Background thread that polls the potentiometer."""
-        print("[Hardware] Volume polling started")
+        logger.info("[Hardware] Volume polling started")
+
+        last_change = time.monotonic()
+        next_poll = last_change
 
         while self._running:
             if self._pot is not None:
                 current_volume = self.read_volume_percent()
 
                 if current_volume >= 0:
-                    # Only update if change exceeds threshold
+                    # Only update if change exceeds threshold plus hysteresis
                     if (
                         self._last_volume < 0
                         or abs(current_volume - self._last_volume)
-                        >= self.VOLUME_THRESHOLD
+                        >= self.VOLUME_THRESHOLD + self.VOLUME_HYSTERESIS
                     ):
                         if self.set_system_volume(current_volume):
                             self._last_volume = current_volume
-                            print(f"[Hardware] Volume set to {current_volume}%")
+                            last_change = time.monotonic()
+                            logger.debug("[Hardware] Volume set to %s%%", current_volume)
 
-            time.sleep(self.POLL_INTERVAL)
+            # Wait until an absolute deadline so time spent reading the ADC
+            # and setting the volume doesn't stretch the polling cadence.
+            # Event.wait lets stop() interrupt the sleep immediately.
+            now = time.monotonic()
+            next_poll += self._poll_interval(now - last_change)
+            if next_poll < now:
+                # Fell behind (e.g. slow amixer) - don't burst to catch up
+                next_poll = now
+            self._stop_event.wait(next_poll - now)
 
-        print("[Hardware] Volume polling stopped")
+        logger.info("[Hardware] Volume polling stopped")
 
     def start(self):
         """Start the hardware monitoring thread."""
@@ -170,17 +280,19 @@ class HardwareController:
             return
 
         if self._pot is None and self._button is None:
-            print("[Hardware] No hardware available, not starting monitor thread")
+            logger.info("[Hardware] No hardware available, not starting monitor thread")
             return
 
         self._running = True
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
-        print("[Hardware] Hardware controller started")
+        logger.info("[Hardware] Hardware controller started")
 
     def stop(self):
         """Stop the hardware monitoring thread."""
         self._running = False
+        self._stop_event.set()
 
         if self._thread is not None:
             self._thread.join(timeout=1)
@@ -190,7 +302,11 @@ class HardwareController:
             self._button.close()
             self._button = None
 
-        print("[Hardware] Hardware controller stopped")
+        if self._mixer is not None:
+            self._mixer.close()
+            self._mixer = None
+
+        logger.info("[Hardware] Hardware controller stopped")
 
     @property
     def is_available(self) -> bool:
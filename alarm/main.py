@@ -1,11 +1,13 @@
 """Main entry point for the alarm service."""
 
+import logging
+import os
 import signal
 import sys
-import time
+import threading
 
-from .scheduler import start_scheduler, stop_scheduler, load_config
-from .player import stop_playback
+from .scheduler import start_scheduler, stop_scheduler, load_config, request_reload
+from .player import start_player, stop_playback, shutdown_player, handle_child_exit
 from .hardware import HardwareController
 
 
@@ -13,9 +15,20 @@ def signal_handler(signum, frame):
     """Handle shutdown signals."""
     print("\n[Alarm] Shutting down...")
     stop_scheduler()
+    shutdown_player()
     sys.exit(0)
 
 
+def _sighup_handler(signum, frame):
+    """Reload the alarm and display config on demand."""
+    request_reload()
+
+
+def _sigchld_handler(signum, frame):
+    """Notice the mpv player exiting without polling for it."""
+    handle_child_exit()
+
+
 # Global hardware controller reference for signal handler
 _hardware: HardwareController = None
 
@@ -30,9 +43,20 @@ def main():
     """Main entry point."""
     global _hardware
     
+    # Display/hardware modules log through `logging` so messages below the
+    # configured level (e.g. per-knob-turn volume changes) are never formatted
+    logging.basicConfig(
+        level=os.environ.get("ALARM_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+    )
+    
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    if hasattr(signal, "SIGCHLD"):
+        signal.signal(signal.SIGCHLD, _sigchld_handler)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, _sighup_handler)
     
     print("=" * 50)
     print("Health Dashboard Alarm Service")
@@ -53,21 +77,30 @@ def main():
         print("Hardware controls not available (software-only mode)")
     print()
     
+    # Start the idle mpv player so alarms only need an IPC command
+    start_player()
+    
     # Start the scheduler
     start_scheduler()
     
     print("Alarm service running. Press Ctrl+C to stop.")
     
-    # Keep running
+    # Keep running - block until a signal arrives (no periodic wakeups)
     try:
-        while True:
-            time.sleep(60)  # Sleep for a minute at a time
+        if hasattr(signal, "pause"):
+            # pause() also returns after SIGCHLD, so keep waiting
+            while True:
+                signal.pause()
+        else:
+            # signal.pause is unavailable on Windows
+            threading.Event().wait()
     except KeyboardInterrupt:
         pass
     finally:
         if _hardware is not None:
             _hardware.stop()
         stop_scheduler()
+        shutdown_player()
 
 
 if __name__ == "__main__":
@@ -1,120 +1,276 @@
 """Music player using mpv."""
 
+import json
 import os
-import signal
+import random
+import shutil
+import socket
 import subprocess
+import time
 from pathlib import Path
 from typing import Optional
 
-from . import MUSIC_DIR
+from . import MUSIC_DIR, MPV_SOCKET
 
-# Supported audio formats
-AUDIO_EXTENSIONS = {".m4a", ".opus", ".mp3", ".wav", ".flac", ".ogg"}
+# Supported audio formats (tuple so it can be passed to str.endswith)
+AUDIO_EXTENSIONS = (".m4a", ".opus", ".mp3", ".wav", ".flac", ".ogg")
 
-# Global reference to current player process
-_current_player: Optional[subprocess.Popen] = None
+# Absolute path to mpv, resolved once. An absolute executable with no
+# preexec_fn/cwd/close_fds/new session lets CPython launch it with
+# posix_spawn instead of fork+exec.
+_MPV_PATH: Optional[str] = shutil.which("mpv")
 
+# Seconds to wait for mpv to create its IPC socket / answer a command
+MPV_STARTUP_TIMEOUT = 5
+MPV_IPC_TIMEOUT = 2
 
-def get_music_files() -> list[Path]:
-    """Get all music files from the music directory."""
-    if not MUSIC_DIR.exists():
+# Global reference to the persistent (idle) mpv process. Cleared by
+# handle_child_exit() when mpv dies, so checks need no waitpid() call.
+_mpv_process: Optional[subprocess.Popen] = None
+
+# Cached music files, keyed by music directory mtime. Stored as a tuple
+# and copied out, so callers can't change the cache.
+_music_files_cache: Optional[tuple[int, tuple[Path, ...]]] = None
+
+
+def get_music_files(sort: bool = False) -> list[Path]:
+    """
+    Get all music files from the music directory.
+    
+    The result is cached until the directory's mtime changes (a file is
+    added, removed or renamed), so repeated calls cost a single stat().
+    Files are in directory order unless sort=True; the alarm shuffles
+    them anyway.
+    """
+    global _music_files_cache
+    
+    try:
+        mtime_ns = os.stat(MUSIC_DIR).st_mtime_ns
+    except OSError:
         return []
     
-    files = []
-    for ext in AUDIO_EXTENSIONS:
-        files.extend(MUSIC_DIR.glob(f"*{ext}"))
+    if _music_files_cache is None or _music_files_cache[0] != mtime_ns:
+        # Single directory pass. Extensions match case-sensitively, as the
+        # old "*.ext" globs did, and hidden files (e.g. macOS "._" metadata
+        # files) are skipped. The name is checked first so is_file() (which
+        # uses the cached dirent type, no extra stat for regular files)
+        # only runs on candidate audio files
+        with os.scandir(MUSIC_DIR) as entries:
+            files = tuple(
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(AUDIO_EXTENSIONS)
+                and not entry.name.startswith(".")
+                and entry.is_file()
+            )
+        _music_files_cache = (mtime_ns, files)
     
-    return sorted(files)
+    files = _music_files_cache[1]
+    return sorted(files) if sort else list(files)
 
 
-def play_random_playlist() -> bool:
+def _mpv_command(*commands: list) -> Optional[list]:
     """
-    Play a shuffled playlist of all music files.
+    Send one or more commands to mpv over its IPC socket.
     
-    Returns True if playback started, False if no files or error.
+    Returns the "data" value of each reply in order, or None if mpv
+    is not reachable.
     """
-    global _current_player
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(MPV_IPC_TIMEOUT)
+            sock.connect(str(MPV_SOCKET))
+            sock.sendall(b"".join(
+                json.dumps({"command": command, "request_id": i}).encode() + b"\n"
+                for i, command in enumerate(commands, start=1)
+            ))
+            
+            results = [None] * len(commands)
+            pending = len(commands)
+            with sock.makefile("rb") as replies:
+                for line in replies:
+                    reply = json.loads(line)
+                    request_id = reply.get("request_id")
+                    if not request_id:
+                        continue  # Asynchronous event, not a reply
+                    if reply.get("error") != "success":
+                        print(f"[Alarm] mpv command {commands[request_id - 1]} failed: {reply.get('error')}")
+                    results[request_id - 1] = reply.get("data")
+                    pending -= 1
+                    if pending == 0:
+                        break
+            return results
+    except (OSError, ValueError):
+        return None
+
+
+def start_player() -> bool:
+    """
+    Start the persistent idle mpv instance if it isn't already running.
     
-    # Stop any existing playback
-    stop_playback()
+    Playback is then driven over IPC, so an alarm doesn't pay mpv's
+    startup and audio device setup cost. Returns True if mpv is running.
+    """
+    global _mpv_process
     
-    music_files = get_music_files()
-    if not music_files:
-        print("[Alarm] No music files found in", MUSIC_DIR)
+    if _mpv_process is not None:
+        return True
+    
+    if _MPV_PATH is None:
+        print("[Alarm] Error: mpv not installed. Run: sudo apt install mpv")
         return False
     
-    print(f"[Alarm] Starting shuffled playlist with {len(music_files)} tracks")
+    # Remove a stale socket left by a previous run
+    try:
+        MPV_SOCKET.unlink()
+    except FileNotFoundError:
+        pass
     
     try:
-        # mpv with shuffle, no video, and loop playlist
         # Using ALSA directly to avoid PulseAudio stuttering issues
-        _current_player = subprocess.Popen(
+        proc = subprocess.Popen(
             [
-                "mpv",
+                _MPV_PATH,
+                "--idle=yes",           # Stay running with an empty playlist
+                f"--input-ipc-server={MPV_SOCKET}",
                 "--no-video",
-                "--shuffle",
+                "--no-terminal",
                 "--loop-playlist=inf",  # Loop forever until stopped
                 "--ao=alsa",            # Use ALSA directly (bypasses PulseAudio)
                 "--audio-buffer=1",     # 1s buffer
                 "--cache=yes",          # Enable cache
-                "--",  # End of options
-                str(MUSIC_DIR),
             ],
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
+            # Our fds are non-inheritable (PEP 446), so skipping the
+            # close_fds sweep is safe and keeps the posix_spawn fast path
+            close_fds=False,
         )
-        return True
     except FileNotFoundError:
         print("[Alarm] Error: mpv not installed. Run: sudo apt install mpv")
         return False
     except Exception as e:
-        print(f"[Alarm] Error starting playback: {e}")
+        print(f"[Alarm] Error starting mpv: {e}")
         return False
+    
+    _mpv_process = proc
+    
+    # Wait for mpv to open its IPC socket
+    deadline = time.monotonic() + MPV_STARTUP_TIMEOUT
+    while not MPV_SOCKET.exists():
+        if proc.poll() is not None or time.monotonic() > deadline:
+            print("[Alarm] Error: mpv did not open its IPC socket")
+            shutdown_player()
+            return False
+        time.sleep(0.05)
+    
+    print(f"[Alarm] mpv player ready (IPC: {MPV_SOCKET})")
+    return True
 
 
-def stop_playback() -> bool:
-    """
-    Stop current music playback.
-    
-    Returns True if stopped, False if nothing was playing.
-    """
-    global _current_player
+def shutdown_player():
+    """Terminate the persistent mpv instance."""
+    global _mpv_process
     
-    if _current_player is None:
-        return False
+    # Detach first: terminating mpv raises SIGCHLD, whose handler
+    # may run while we wait below
+    proc, _mpv_process = _mpv_process, None
+    if proc is None:
+        return
     
     try:
         # Send SIGTERM for graceful shutdown
-        _current_player.terminate()
-        _current_player.wait(timeout=2)
+        proc.terminate()
+        proc.wait(timeout=2)
     except subprocess.TimeoutExpired:
         # Force kill if it doesn't respond
-        _current_player.kill()
-        _current_player.wait()
+        proc.kill()
+        proc.wait()
     except Exception as e:
-        print(f"[Alarm] Error stopping playback: {e}")
+        print(f"[Alarm] Error stopping mpv: {e}")
     
-    _current_player = None
-    print("[Alarm] Playback stopped")
+    try:
+        MPV_SOCKET.unlink()
+    except FileNotFoundError:
+        pass
+    print("[Alarm] mpv player shut down")
+
+
+def play_random_playlist() -> bool:
+    """
+    Play a shuffled playlist of all music files.
+    
+    Returns True if playback started, False if no files or error.
+    """
+    music_files = get_music_files()
+    if not music_files:
+        print("[Alarm] No music files found in", MUSIC_DIR)
+        return False
+    
+    if not start_player():
+        return False
+    
+    print(f"[Alarm] Starting shuffled playlist with {len(music_files)} tracks")
+    
+    # "replace" on the first track also stops anything already playing
+    tracks = random.sample(music_files, len(music_files))
+    commands = [["loadfile", str(tracks[0]), "replace"]]
+    commands.extend(["loadfile", str(track), "append"] for track in tracks[1:])
+    
+    if _mpv_command(*commands) is None:
+        print("[Alarm] Error starting playback: mpv not responding")
+        return False
     return True
 
 
-def is_playing() -> bool:
-    """Check if music is currently playing."""
-    global _current_player
+def stop_playback() -> bool:
+    """
+    Stop current music playback.
+    
+    Works from any process (e.g. the web app) since it goes through
+    mpv's IPC socket. mpv itself stays running, idle.
     
-    if _current_player is None:
+    Returns True if stopped, False if nothing was playing.
+    """
+    results = _mpv_command(["get_property", "idle-active"], ["stop"])
+    if results is None or results[0] is not False:
         return False
     
-    # Check if process is still running
-    return _current_player.poll() is None
+    print("[Alarm] Playback stopped")
+    return True
+
+
+def is_playing() -> bool:
+    """
+    Check if music is currently playing.
+    
+    Always asks mpv, so playback stopped by another process over IPC or
+    ended on its own is never reported as still running.
+    """
+    results = _mpv_command(["get_property", "idle-active"])
+    return results is not None and results[0] is False
 
 
 def get_player_pid() -> Optional[int]:
     """Get the PID of the current player process."""
-    global _current_player
-    
-    if _current_player is None or _current_player.poll() is not None:
+    proc = _mpv_process
+    if proc is None or not is_playing():
         return None
     
-    return _current_player.pid
+    return proc.pid
+
+
+def handle_child_exit():
+    """
+    Forget the mpv process if it has exited.
+    
+    Meant to be called from a SIGCHLD handler, so the exit is noticed
+    once when it happens instead of polling waitpid() on every check.
+    The next alarm restarts mpv.
+    """
+    global _mpv_process
+    
+    proc = _mpv_process
+    if proc is not None and proc.poll() is not None:
+        _mpv_process = None
+        print(f"[Alarm] mpv exited unexpectedly (code {proc.returncode})")
@@ -2,19 +2,52 @@
 
 import json
 import os
-from datetime import datetime, date
+import select
+import threading
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Optional
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.combining import OrTrigger
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import exists
+
+from app import create_app, db
+from app.models import (
+    SleepEntry, WorkoutEntry, CalorieEntry,
+    CustomMetric, CustomMetricEntry
+)
 
 from . import CONFIG_FILE, PROJECT_DIR
 from .player import play_random_playlist, stop_playback
 from .display import display_on
 
-# Flask app for database access (lazy loaded)
+# orjson available flag (faster JSON, falls back to stdlib json)
+ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+    
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+# inotify available flag (Linux only, falls back to mtime polling)
+INOTIFY_AVAILABLE = False
+
+try:
+    from inotify_simple import INotify, flags
+    
+    INOTIFY_AVAILABLE = True
+except ImportError as e:
+    print(f"[Alarm] inotify not available, using config polling: {e}")
+
+# Flask app for database access, created once at scheduler start
 _flask_app = None
+_flask_app_lock = threading.Lock()
 
 # Config files
 DISPLAY_CONFIG_FILE = PROJECT_DIR / "data" / "display_config.json"
@@ -22,15 +55,114 @@ DISPLAY_CONFIG_FILE = PROJECT_DIR / "data" / "display_config.json"
 # Global scheduler instance
 _scheduler: Optional[BackgroundScheduler] = None
 
-# Job IDs
-ALARM_JOB_ID = "morning_alarm"
-DISPLAY_WAKE_JOB_ID = "display_wake"
+# Job ID for the dispatcher that runs alarm, display wake and autofill
+TICK_JOB_ID = "tick"
 CONFIG_CHECK_JOB_ID = "config_check"
-AUTOFILL_JOB_ID = "autofill_data"
 
-# Track config file modification times
-_last_config_mtime: float = 0
-_last_display_config_mtime: float = 0
+# Seconds between config checks when inotify is unavailable. Send the
+# service SIGHUP to reload immediately instead of waiting.
+CONFIG_POLL_INTERVAL = 30
+
+# Time (hour, minute) to auto-fill missing data
+AUTOFILL_TIME = (23, 59)
+
+# Config day names in datetime.weekday() order, and the reverse lookup
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DAY_INDEX = {name: i for i, name in enumerate(DAY_NAMES)}
+
+
+@dataclass(frozen=True)
+class AlarmSpec:
+    """Parsed alarm schedule; weekdays use datetime.weekday() numbering."""
+    enabled: bool
+    hour: int = 0
+    minute: int = 0
+    weekdays: frozenset[int] = frozenset()
+
+
+@dataclass(frozen=True)
+class DisplayWakeSpec:
+    """Parsed display wake schedule."""
+    enabled: bool
+    hour: int = 0
+    minute: int = 0
+
+
+# Active schedules, refreshed by reload_schedule/reload_display_schedule
+_alarm_spec = AlarmSpec(enabled=False)
+_display_wake_spec = DisplayWakeSpec(enabled=False)
+
+# Fire times the installed tick trigger was built from
+_tick_trigger_key: Optional[tuple] = None
+
+# Serializes spec updates with building and installing the tick trigger;
+# the alarm and display reloads run on separate debounce timers
+_schedule_lock = threading.Lock()
+
+# Last seen config file mtimes in ns, 0 if missing (polling fallback)
+_last_config_mtimes: dict[Path, int] = {}
+
+# Parsed config files: path -> ((st_mtime_ns, st_size), parsed JSON)
+_config_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+# Quiet period before reloading a changed config, so an editor's
+# write/rename burst triggers a single reload
+DEBOUNCE_MS = 500
+
+# Pending debounced reloads: config path -> timer
+_reload_timers: dict[Path, threading.Timer] = {}
+_reload_timers_lock = threading.Lock()
+
+# Config watcher thread and the write end of its wake-up pipe
+_config_watcher: Optional[threading.Thread] = None
+_config_watcher_stop: Optional[int] = None
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, with orjson if available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(config: dict) -> bytes:
+    """Serialize a config as indented JSON with a trailing newline."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(config, indent=2) + "\n").encode()
+
+
+def _load_json_cached(path: Path, default_config: dict, log_prefix: str) -> dict:
+    """
+    Load a JSON config file merged over defaults.
+    
+    The parsed file is cached by mtime and size, so repeated loads of an
+    unchanged file cost a single stat(). Size catches rewrites that land
+    within the filesystem's timestamp granularity.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _config_cache.pop(path, None)
+        return default_config
+    except OSError as e:
+        print(f"{log_prefix} Error loading config: {e}")
+        return default_config
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path)
+    if cached is None or cached[0] != key:
+        try:
+            with open(path, "rb") as f:
+                config = _json_loads(f.read())
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"{log_prefix} Error loading config: {e}")
+            return default_config
+        cached = (key, config)
+        _config_cache[path] = cached
+    
+    # Merge with defaults for any missing keys
+    return {**default_config, **cached[1]}
 
 
 def load_config() -> dict:
@@ -40,32 +172,47 @@ def load_config() -> dict:
         "time": "08:00",
         "days": ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
     }
-    
-    if not CONFIG_FILE.exists():
-        return default_config
-    
-    try:
-        with open(CONFIG_FILE, "r") as f:
-            config = json.load(f)
-        # Merge with defaults for any missing keys
-        return {**default_config, **config}
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"[Alarm] Error loading config: {e}")
-        return default_config
+    return _load_json_cached(CONFIG_FILE, default_config, "[Alarm]")
 
 
 def save_config(config: dict) -> bool:
-    """Save alarm configuration to JSON file."""
+    """
+    Save alarm configuration to JSON file.
+    
+    The JSON is written to a temporary file and renamed over the config,
+    so a failed save leaves the previous config intact.
+    """
     try:
-        # Ensure data directory exists
-        CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        data = _json_dumps(config)
+    except (TypeError, ValueError) as e:
+        print(f"[Alarm] Error saving config: {e}")
+        return False
+    
+    tmp_path = CONFIG_FILE.with_name(CONFIG_FILE.name + ".tmp")
+    try:
+        try:
+            f = open(tmp_path, "wb")
+        except FileNotFoundError:
+            # Create the data directory only when it is actually missing
+            CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            f = open(tmp_path, "wb")
+        
+        with f:
+            f.write(data)
+            f.flush()
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, CONFIG_FILE)
         
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-            f.write("\n")
+        # We just wrote it, so seed the cache instead of reparsing later
+        # (renaming keeps the mtime and size)
+        _config_cache[CONFIG_FILE] = ((st.st_mtime_ns, st.st_size), dict(config))
         return True
     except IOError as e:
         print(f"[Alarm] Error saving config: {e}")
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
         return False
 
 
@@ -75,17 +222,7 @@ def load_display_config() -> dict:
         "wake_time": "07:00",
         "wake_enabled": True
     }
-    
-    if not DISPLAY_CONFIG_FILE.exists():
-        return default_config
-    
-    try:
-        with open(DISPLAY_CONFIG_FILE, "r") as f:
-            config = json.load(f)
-        return {**default_config, **config}
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"[Display] Error loading config: {e}")
-        return default_config
+    return _load_json_cached(DISPLAY_CONFIG_FILE, default_config, "[Display]")
 
 
 def _alarm_trigger():
@@ -103,9 +240,10 @@ def _display_wake_trigger():
 def _get_flask_app():
     """Get or create Flask app for database access."""
     global _flask_app
-    if _flask_app is None:
-        from app import create_app
-        _flask_app = create_app()
+    # Jobs run on scheduler worker threads; make sure only one creates it
+    with _flask_app_lock:
+        if _flask_app is None:
+            _flask_app = create_app()
     return _flask_app
 
 
@@ -127,23 +265,25 @@ def _autofill_missing_data():
         app = _get_flask_app()
         
         with app.app_context():
-            from app import db
-            from app.models import (
-                SleepEntry, WorkoutEntry, CalorieEntry,
-                CustomMetric, CustomMetricEntry
-            )
-            
             today = date.today()
             filled = []
+            new_entries = []
+            
+            # One round trip for the fixed tables
+            has_sleep, has_workout, has_calories = db.session.query(
+                exists().where(SleepEntry.date == today),
+                exists().where(WorkoutEntry.date == today),
+                exists().where(CalorieEntry.date == today),
+            ).one()
             
             # Check sleep
-            if not SleepEntry.query.filter_by(date=today).first():
-                db.session.add(SleepEntry(date=today, hours=0))
+            if not has_sleep:
+                new_entries.append(SleepEntry(date=today, hours=0))
                 filled.append("sleep")
             
             # Check workouts
-            if not WorkoutEntry.query.filter_by(date=today).first():
-                db.session.add(WorkoutEntry(
+            if not has_workout:
+                new_entries.append(WorkoutEntry(
                     date=today, 
                     workout_type="None",
                     duration_minutes=0
@@ -151,21 +291,23 @@ def _autofill_missing_data():
                 filled.append("workouts")
             
             # Check calories
-            if not CalorieEntry.query.filter_by(date=today).first():
-                db.session.add(CalorieEntry(
+            if not has_calories:
+                new_entries.append(CalorieEntry(
                     date=today,
                     meal_name="No meals logged",
                     calories=0
                 ))
                 filled.append("calories")
             
-            # Check custom metrics
-            custom_metrics = CustomMetric.query.all()
-            for metric in custom_metrics:
-                if not CustomMetricEntry.query.filter_by(
-                    metric_id=metric.id, date=today
-                ).first():
-                    db.session.add(CustomMetricEntry(
+            # Check custom metrics against the set already logged today
+            logged_metric_ids = {
+                metric_id for (metric_id,) in db.session.query(
+                    CustomMetricEntry.metric_id
+                ).filter_by(date=today)
+            }
+            for metric in CustomMetric.query.all():
+                if metric.id not in logged_metric_ids:
+                    new_entries.append(CustomMetricEntry(
                         metric_id=metric.id,
                         date=today,
                         value=0
@@ -173,6 +315,7 @@ def _autofill_missing_data():
                     filled.append(metric.name)
             
             if filled:
+                db.session.bulk_save_objects(new_entries)
                 db.session.commit()
                 print(f"[Autofill] Filled missing data: {', '.join(filled)}")
             else:
@@ -187,161 +330,388 @@ def get_scheduler() -> BackgroundScheduler:
     global _scheduler
     
     if _scheduler is None:
-        _scheduler = BackgroundScheduler()
+        # Jobs are short and I/O bound, so a single worker thread (instead
+        # of the default pool of 10) is enough and runs them in order
+        _scheduler = BackgroundScheduler(
+            executors={"default": ThreadPoolExecutor(max_workers=1)}
+        )
     
     return _scheduler
 
 
+def _parse_time(time_str: str) -> tuple[int, int]:
+    """Parse an "HH:MM" string into (hour, minute), raising ValueError if invalid."""
+    # partition + digit checks beat both split/map and a regex here, and
+    # reject non-strings and stray whitespace/signs up front
+    if not isinstance(time_str, str):
+        raise ValueError(f"invalid time: {time_str!r}")
+    hour_str, sep, minute_str = time_str.partition(":")
+    if not (
+        sep
+        and 1 <= len(hour_str) <= 2 and hour_str.isdigit()
+        and len(minute_str) == 2 and minute_str.isdigit()
+    ):
+        raise ValueError(f"invalid time: {time_str!r}")
+    hour, minute = int(hour_str), int(minute_str)
+    if hour > 23 or minute > 59:
+        raise ValueError(f"time out of range: {time_str}")
+    return hour, minute
+
+
+def parse_alarm_config(config: dict) -> AlarmSpec:
+    """Parse alarm config into an AlarmSpec, raising ValueError on a bad time."""
+    if not config.get("enabled", True):
+        return AlarmSpec(enabled=False)
+    
+    hour, minute = _parse_time(config.get("time", "08:00"))
+    days = config.get("days", DAY_NAMES)
+    weekdays = frozenset(
+        DAY_INDEX[day.lower()] for day in days if day.lower() in DAY_INDEX
+    )
+    return AlarmSpec(enabled=True, hour=hour, minute=minute, weekdays=weekdays)
+
+
+def parse_display_config(config: dict) -> DisplayWakeSpec:
+    """Parse display config into a DisplayWakeSpec, raising ValueError on a bad time."""
+    if not config.get("wake_enabled", True):
+        return DisplayWakeSpec(enabled=False)
+    
+    hour, minute = _parse_time(config.get("wake_time", "07:00"))
+    return DisplayWakeSpec(enabled=True, hour=hour, minute=minute)
+
+
+def _apply_alarm_config(config: dict) -> bool:
+    """Apply a parsed alarm config, rescheduling only if it changed."""
+    global _alarm_spec
+    
+    valid = True
+    
+    try:
+        spec = parse_alarm_config(config)
+    except ValueError:
+        print(f"[Alarm] Invalid time format: {config.get('time')}")
+        spec = AlarmSpec(enabled=False)
+        valid = False
+    
+    with _schedule_lock:
+        # Saves that don't change the schedule leave the job untouched
+        if spec == _alarm_spec:
+            return valid
+        _alarm_spec = spec
+        
+        if not spec.enabled:
+            if valid:
+                print("[Alarm] Alarm is disabled")
+        else:
+            days = ",".join(DAY_NAMES[day] for day in sorted(spec.weekdays))
+            print(f"[Alarm] Scheduled for {spec.hour:02d}:{spec.minute:02d} on {days}")
+        
+        _reschedule_tick()
+    return valid
+
+
 def reload_schedule() -> bool:
     """Reload the alarm schedule from config."""
-    scheduler = get_scheduler()
-    config = load_config()
+    return _apply_alarm_config(load_config())
+
+
+def _apply_display_config(config: dict) -> bool:
+    """Apply a parsed display config, rescheduling only if it changed."""
+    global _display_wake_spec
     
-    # Remove existing alarm job if present
-    try:
-        scheduler.remove_job(ALARM_JOB_ID)
-    except Exception:
-        pass  # Job might not exist
+    valid = True
     
-    if not config.get("enabled", True):
-        print("[Alarm] Alarm is disabled")
-    else:
-        # Parse time
-        time_str = config.get("time", "08:00")
-        try:
-            hour, minute = map(int, time_str.split(":"))
-        except ValueError:
-            print(f"[Alarm] Invalid time format: {time_str}")
-            return False
-        
-        # Parse days
-        days = config.get("days", ["mon", "tue", "wed", "thu", "fri", "sat", "sun"])
-        day_of_week = ",".join(days)
+    try:
+        spec = parse_display_config(config)
+    except ValueError:
+        print(f"[Display] Invalid time format: {config.get('wake_time')}")
+        spec = DisplayWakeSpec(enabled=False)
+        valid = False
+    
+    with _schedule_lock:
+        # Saves that don't change the schedule leave the job untouched
+        if spec == _display_wake_spec:
+            return valid
+        _display_wake_spec = spec
         
-        # Create cron trigger
-        trigger = CronTrigger(
-            day_of_week=day_of_week,
-            hour=hour,
-            minute=minute
-        )
+        if not spec.enabled:
+            if valid:
+                print("[Display] Display wake is disabled")
+        else:
+            print(f"[Display] Wake scheduled for {spec.hour:02d}:{spec.minute:02d} daily")
         
-        # Add job
-        scheduler.add_job(
-            _alarm_trigger,
-            trigger=trigger,
-            id=ALARM_JOB_ID,
-            replace_existing=True
-        )
-        
-        print(f"[Alarm] Scheduled for {time_str} on {day_of_week}")
-    
-    return True
+        _reschedule_tick()
+    return valid
 
 
 def reload_display_schedule() -> bool:
     """Reload the display wake schedule from config."""
-    scheduler = get_scheduler()
-    config = load_display_config()
+    return _apply_display_config(load_display_config())
+
+
+def _tick_fire_times() -> tuple:
+    """Cron fields the tick trigger is built from, as a comparable key."""
+    wake = _display_wake_spec
+    alarm = _alarm_spec
+    return (
+        AUTOFILL_TIME,
+        (wake.hour, wake.minute) if wake.enabled else None,
+        (alarm.hour, alarm.minute, tuple(sorted(alarm.weekdays)))
+        if alarm.enabled and alarm.weekdays else None,
+    )
+
+
+def _build_tick_trigger() -> OrTrigger:
+    """
+    Build a trigger that fires only at minutes with something scheduled.
     
-    # Remove existing display wake job if present
-    try:
-        scheduler.remove_job(DISPLAY_WAKE_JOB_ID)
-    except Exception:
-        pass  # Job might not exist
+    Callers hold _schedule_lock, so the trigger and _tick_trigger_key
+    match the specs that end up installed.
+    """
+    global _tick_trigger_key
     
-    if not config.get("wake_enabled", True):
-        print("[Display] Display wake is disabled")
-        return True
+    _tick_trigger_key = _tick_fire_times()
+    autofill, wake, alarm = _tick_trigger_key
+    triggers = [CronTrigger(hour=autofill[0], minute=autofill[1])]
     
-    # Parse time
-    time_str = config.get("wake_time", "07:00")
-    try:
-        hour, minute = map(int, time_str.split(":"))
-    except ValueError:
-        print(f"[Display] Invalid time format: {time_str}")
-        return False
+    if wake is not None:
+        triggers.append(CronTrigger(hour=wake[0], minute=wake[1]))
     
-    # Create cron trigger (every day)
-    trigger = CronTrigger(
-        hour=hour,
-        minute=minute
-    )
+    if alarm is not None:
+        # APScheduler numbers days like datetime.weekday() (0 = Monday)
+        hour, minute, weekdays = alarm
+        day_of_week = ",".join(str(day) for day in weekdays)
+        triggers.append(CronTrigger(
+            day_of_week=day_of_week, hour=hour, minute=minute
+        ))
     
-    # Add job
-    scheduler.add_job(
-        _display_wake_trigger,
-        trigger=trigger,
-        id=DISPLAY_WAKE_JOB_ID,
-        replace_existing=True
-    )
+    return OrTrigger(triggers)
+
+
+def _reschedule_tick():
+    """
+    Recompute the dispatcher's next run time after a schedule change.
     
-    print(f"[Display] Wake scheduled for {time_str} daily")
-    return True
+    Must be called with _schedule_lock held.
+    """
+    # Spec changes that fire at the same times (e.g. disabling an alarm
+    # with no days selected) leave the job alone
+    if _tick_fire_times() == _tick_trigger_key:
+        return
+    if _scheduler is not None and _scheduler.get_job(TICK_JOB_ID) is not None:
+        _scheduler.reschedule_job(TICK_JOB_ID, trigger=_build_tick_trigger())
 
 
-def _check_config_changed():
-    """Check if config files have changed and reload if needed."""
-    global _last_config_mtime, _last_display_config_mtime
+def _tick():
+    """
+    Dispatch scheduled actions for the current minute.
+    
+    A single job covers the alarm, display wake and autofill. Its trigger
+    only fires at minutes where one of them is due, so the scheduler
+    thread sleeps until the next event instead of waking periodically.
+    """
+    now = datetime.now()
+    hhmm = (now.hour, now.minute)
+    
+    wake = _display_wake_spec
+    if wake.enabled and hhmm == (wake.hour, wake.minute):
+        _display_wake_trigger()
+    
+    alarm = _alarm_spec
+    if (
+        alarm.enabled
+        and hhmm == (alarm.hour, alarm.minute)
+        and now.weekday() in alarm.weekdays
+    ):
+        _alarm_trigger()
+    
+    if hhmm == AUTOFILL_TIME:
+        _autofill_missing_data()
+
+
+def _run_reload(path: Path):
+    """Timer callback: reload the schedule for a changed config file."""
+    with _reload_timers_lock:
+        _reload_timers.pop(path, None)
+    
+    if path == CONFIG_FILE:
+        prefix, reload = "[Alarm]", reload_schedule
+    else:
+        prefix, reload = "[Display]", reload_display_schedule
     
-    # Check alarm config
+    print(f"{prefix} Config file changed, reloading schedule...")
     try:
-        if CONFIG_FILE.exists():
-            current_mtime = os.path.getmtime(CONFIG_FILE)
-            if current_mtime > _last_config_mtime:
-                print("[Alarm] Config file changed, reloading schedule...")
-                _last_config_mtime = current_mtime
-                reload_schedule()
+        reload()
     except Exception as e:
-        print(f"[Alarm] Error checking config: {e}")
+        print(f"{prefix} Error reloading config: {e}")
+
+
+def _schedule_reload(path: Path):
+    """
+    Reload a config after DEBOUNCE_MS without further changes.
+    
+    Each change restarts the timer for its file, so a burst of writes
+    collapses into one reload.
+    """
+    with _reload_timers_lock:
+        timer = _reload_timers.get(path)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(DEBOUNCE_MS / 1000, _run_reload, args=(path,))
+        timer.daemon = True
+        _reload_timers[path] = timer
+        timer.start()
+
+
+def request_reload():
+    """Reload both config files now (e.g. on SIGHUP), without waiting for a change."""
+    for path in (CONFIG_FILE, DISPLAY_CONFIG_FILE):
+        _schedule_reload(path)
+
+
+def _cancel_pending_reloads():
+    """Cancel debounced reloads that have not fired yet."""
+    with _reload_timers_lock:
+        for timer in _reload_timers.values():
+            timer.cancel()
+        _reload_timers.clear()
+
+
+def _config_mtime_ns(path: Path) -> int:
+    """Return a config file's mtime in ns with a single stat(), 0 if missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _check_config_changed():
+    """Check if config files have changed and reload if needed."""
+    for path, log_prefix in ((CONFIG_FILE, "[Alarm]"), (DISPLAY_CONFIG_FILE, "[Display]")):
+        try:
+            mtime_ns = _config_mtime_ns(path)
+            if mtime_ns and mtime_ns != _last_config_mtimes.get(path):
+                _last_config_mtimes[path] = mtime_ns
+                # The reload parses the file once through the cached loader
+                _schedule_reload(path)
+        except Exception as e:
+            print(f"{log_prefix} Error checking config: {e}")
+
+
+def _config_watcher_loop(inotify: "INotify", stop_fd: int):
+    """Background thread that reloads schedules on config file writes."""
+    try:
+        while True:
+            readable, _, _ = select.select([inotify, stop_fd], [], [])
+            if stop_fd in readable:
+                break
+    
+            # Coalesce events so a create+write burst reloads only once
+            names = {event.name for event in inotify.read(timeout=0)}
+            
+            for path in (CONFIG_FILE, DISPLAY_CONFIG_FILE):
+                if path.name in names:
+                    _schedule_reload(path)
+    finally:
+        inotify.close()
+        os.close(stop_fd)
+
+
+def _start_config_watcher() -> bool:
+    """
+    Watch the data directory for config writes using inotify.
+    
+    The directory is watched rather than the files so editors that save
+    by writing a new file and renaming it over the old one are caught.
+    Returns False if the watch could not be set up (e.g. the inotify
+    watch limit is exhausted), so the caller can fall back to polling.
+    """
+    global _config_watcher, _config_watcher_stop
+    
+    CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
     
-    # Check display config
     try:
-        if DISPLAY_CONFIG_FILE.exists():
-            current_mtime = os.path.getmtime(DISPLAY_CONFIG_FILE)
-            if current_mtime > _last_display_config_mtime:
-                print("[Display] Config file changed, reloading schedule...")
-                _last_display_config_mtime = current_mtime
-                reload_display_schedule()
-    except Exception as e:
-        print(f"[Display] Error checking config: {e}")
+        inotify = INotify()
+    except OSError as e:
+        print(f"[Alarm] Could not start config watcher: {e}")
+        return False
+    try:
+        inotify.add_watch(
+            str(CONFIG_FILE.parent),
+            flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE,
+        )
+    except OSError as e:
+        inotify.close()
+        print(f"[Alarm] Could not start config watcher: {e}")
+        return False
+    
+    # select() on a pipe lets stop_scheduler wake the blocked thread
+    stop_r, _config_watcher_stop = os.pipe()
+    _config_watcher = threading.Thread(
+        target=_config_watcher_loop, args=(inotify, stop_r), daemon=True
+    )
+    _config_watcher.start()
+    return True
+
+
+def _stop_config_watcher():
+    """Signal the config watcher thread to exit."""
+    global _config_watcher, _config_watcher_stop
+    
+    if _config_watcher_stop is not None:
+        os.write(_config_watcher_stop, b"\0")
+        os.close(_config_watcher_stop)
+        _config_watcher_stop = None
+    
+    if _config_watcher is not None:
+        _config_watcher.join(timeout=1)
+        _config_watcher = None
 
 
 def start_scheduler():
     """Start the scheduler."""
-    global _last_config_mtime, _last_display_config_mtime
-    
     scheduler = get_scheduler()
     
     if scheduler.running:
         return
     
     # Record initial config mtimes
-    if CONFIG_FILE.exists():
-        _last_config_mtime = os.path.getmtime(CONFIG_FILE)
-    if DISPLAY_CONFIG_FILE.exists():
-        _last_display_config_mtime = os.path.getmtime(DISPLAY_CONFIG_FILE)
+    for path in (CONFIG_FILE, DISPLAY_CONFIG_FILE):
+        _last_config_mtimes[path] = _config_mtime_ns(path)
     
     # Load schedules
     reload_schedule()
     reload_display_schedule()
     
-    # Add periodic config check (every 10 seconds)
-    scheduler.add_job(
-        _check_config_changed,
-        'interval',
-        seconds=10,
-        id=CONFIG_CHECK_JOB_ID,
-        replace_existing=True
-    )
+    # Create the app now so the 23:59 autofill only pays for its queries
+    try:
+        _get_flask_app()
+    except Exception as e:
+        print(f"[Autofill] Error initializing database: {e}")
     
-    # Add autofill job at 23:59 daily
-    scheduler.add_job(
-        _autofill_missing_data,
-        CronTrigger(hour=23, minute=59),
-        id=AUTOFILL_JOB_ID,
-        replace_existing=True
-    )
-    print("[Autofill] Scheduled for 23:59 daily")
+    # Reload on file write events; poll only if inotify is unavailable
+    if not (INOTIFY_AVAILABLE and _start_config_watcher()):
+        # Add periodic config check
+        scheduler.add_job(
+            _check_config_changed,
+            'interval',
+            seconds=CONFIG_POLL_INTERVAL,
+            id=CONFIG_CHECK_JOB_ID,
+            replace_existing=True
+        )
+    
+    # Single dispatcher job, woken only when something is due
+    with _schedule_lock:
+        scheduler.add_job(
+            _tick,
+            _build_tick_trigger(),
+            id=TICK_JOB_ID,
+            replace_existing=True,
+            misfire_grace_time=30,
+            coalesce=True
+        )
+    hour, minute = AUTOFILL_TIME
+    print(f"[Autofill] Scheduled for {hour:02d}:{minute:02d} daily")
     
     scheduler.start()
     print("[Alarm] Scheduler started (config auto-reload enabled)")
@@ -352,6 +722,8 @@ def stop_scheduler():
     global _scheduler
     
     stop_playback()
+    _stop_config_watcher()
+    _cancel_pending_reloads()
     
     if _scheduler is not None and _scheduler.running:
         _scheduler.shutdown(wait=False)
@@ -362,13 +734,20 @@ def stop_scheduler():
 
 def get_next_alarm_time() -> Optional[datetime]:
     """Get the next scheduled alarm time."""
-    scheduler = get_scheduler()
+    alarm = _alarm_spec
+    if not alarm.enabled:
+        return None
     
-    try:
-        job = scheduler.get_job(ALARM_JOB_ID)
-        if job and job.next_run_time:
-            return job.next_run_time
-    except Exception:
-        pass
+    now = datetime.now()
+    candidate = now.replace(
+        hour=alarm.hour, minute=alarm.minute, second=0, microsecond=0
+    )
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    
+    for _ in range(7):
+        if candidate.weekday() in alarm.weekdays:
+            return candidate
+        candidate += timedelta(days=1)
     
     return None
@@ -3,24 +3,91 @@
 import json
 import os
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+
+# orjson available flag (faster JSON, falls back to stdlib json)
+ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+    
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
 
 db = SQLAlchemy()
 
+# Data directory (databases and config), resolved once at import
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# Parsed app configs: path -> ((st_mtime_ns, st_size), parsed JSON)
+_app_config_cache: dict = {}
+
 
-def load_app_config(data_dir: str) -> dict:
-    """Load application config from data/config.json."""
+def load_app_config(data_dir: str = DATA_DIR) -> dict:
+    """Load application config from data/config.json (cached until it changes)."""
     config_path = os.path.join(data_dir, "config.json")
     default_config = {"database": "health.db"}
     
-    if not os.path.exists(config_path):
-        return default_config
-    
     try:
-        with open(config_path, "r") as f:
-            return {**default_config, **json.load(f)}
-    except (json.JSONDecodeError, IOError):
+        st = os.stat(config_path)
+    except OSError:
         return default_config
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _app_config_cache.get(config_path)
+    if cached is None or cached[0] != key:
+        try:
+            with open(config_path, "rb") as f:
+                data = f.read()
+            config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        except (json.JSONDecodeError, IOError):
+            return default_config
+        cached = (key, config)
+        _app_config_cache[config_path] = cached
+    
+    return {**default_config, **cached[1]}
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, for request.get_json() and jsonify.
+    
+    Output matches the default provider's: keys are sorted, and dates and
+    other types orjson doesn't handle natively go through the default
+    provider's conversion (e.g. dates as HTTP date strings).
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune each new SQLite connection for SD-card storage.
+    
+    WAL lets the web app and the alarm daemon read while the other
+    writes, and synchronous=NORMAL is still crash-safe under WAL while
+    syncing far less often than the default FULL.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.close()
 
 
 def create_app(config=None):
@@ -30,17 +97,18 @@ def create_app(config=None):
         template_folder="../templates",
         static_folder="../static",
     )
+    
+    # Parse request bodies and serialize jsonify() responses with orjson
+    if ORJSON_AVAILABLE:
+        app.json = ORJSONProvider(app)
 
     # Default configuration
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-key-change-in-production")
     
     # Database path - use data/ directory
     # Database name can be set in data/config.json: {"database": "private-health.db"}
-    data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-    os.makedirs(data_dir, exist_ok=True)
-    
-    app_config = load_app_config(data_dir)
-    db_path = os.path.join(data_dir, app_config["database"])
+    app_config = load_app_config()
+    db_path = os.path.join(DATA_DIR, app_config["database"])
     app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
@@ -57,7 +125,26 @@ def create_app(config=None):
 
     # Create database tables
     with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _set_sqlite_pragmas)
+        
         db.create_all()
+        
+        # create_all() skips tables that already exist, so add indexes
+        # introduced since an existing database was created
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+        
+        # Gather planner statistics once per database so SQLite picks the
+        # date indexes for per-day lookups (e.g. the nightly autofill)
+        if db.engine.dialect.name == "sqlite":
+            with db.engine.begin() as conn:
+                has_stats = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+                )).first()
+                if not has_stats:
+                    conn.execute(text("ANALYZE"))
     
     # Initialize food database
     from app.food_db import init_food_db
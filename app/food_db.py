@@ -3,8 +3,21 @@
 import sqlite3
 import os
 import re
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Optional
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+# NumPy available flag (vectorized ranking, falls back to process.extract)
+NUMPY_AVAILABLE = False
+
+try:
+    import numpy as np
+    
+    NUMPY_AVAILABLE = True
+except ImportError:
+    pass
 
 # Path to the food database (separate from health data)
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
@@ -53,19 +66,211 @@ VOLUME_CONVERSIONS = {
 # Piece units (no conversion needed)
 PIECE_UNITS = {"piece", "pieces", "item", "items", "serving", "servings", "slice", "slices"}
 
+# Every known unit -> (factor to canonical, canonical unit, unit type),
+# so unit checks and conversions are a single dict lookup
+_UNIT_TABLE = {
+    **{unit: (factor, "g", "mass") for unit, factor in MASS_CONVERSIONS.items()},
+    **{unit: (factor, "ml", "volume") for unit, factor in VOLUME_CONVERSIONS.items()},
+    **{unit: (1.0, "piece", "piece") for unit in PIECE_UNITS},
+}
+_UNKNOWN_UNIT = (1.0, None, "unknown")
+
+# Quantity text: number (with optional decimal) followed by optional space and unit
+_QUANTITY_RE = re.compile(r"^(\d+\.?\d*)\s*(.+)$")
+
+# Schema version recorded in PRAGMA user_version once init_food_db has
+# brought the database up to date. Bump it when adding a migration step.
+FOOD_SCHEMA_VERSION = 2
+
+# Full-text index available flag (set by init_food_db, needs SQLite FTS5)
+FTS_AVAILABLE = False
+
+# Escapes LIKE wildcards in user input, with backslash as the ESCAPE character
+_LIKE_ESCAPES = str.maketrans({"%": r"\%", "_": r"\_", "\\": r"\\"})
+
+# Words in a search query, turned into FTS5 prefix terms
+_QUERY_WORD_RE = re.compile(r"\w+")
+
+# Full-text index over food names and aliases (rowid = foods.id), kept in
+# sync by triggers so scripts writing with plain SQL don't need to know
+# about it
+_FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS foods_fts USING fts5(
+        name, aliases, tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS foods_fts_insert AFTER INSERT ON foods BEGIN
+        INSERT INTO foods_fts (rowid, name, aliases) VALUES (new.id, new.name, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS foods_fts_update AFTER UPDATE OF name ON foods BEGIN
+        UPDATE foods_fts SET name = new.name WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS foods_fts_delete AFTER DELETE ON foods BEGIN
+        DELETE FROM foods_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS food_aliases_fts_insert AFTER INSERT ON food_aliases BEGIN
+        UPDATE foods_fts SET aliases = aliases || ' ' || new.alias WHERE rowid = new.food_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS food_aliases_fts_delete AFTER DELETE ON food_aliases BEGIN
+        UPDATE foods_fts
+        SET aliases = COALESCE((SELECT group_concat(alias, ' ') FROM food_aliases WHERE food_id = old.food_id), '')
+        WHERE rowid = old.food_id;
+    END
+    """,
+]
+
+
+# Single-row table holding the number of foods, so counting them doesn't
+# scan the table. Seeded from the existing rows when it is created.
+_STATS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS food_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        foods_count INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO food_stats (id, foods_count) SELECT 1, COUNT(*) FROM foods;
+    CREATE TRIGGER IF NOT EXISTS food_stats_insert AFTER INSERT ON foods BEGIN
+        UPDATE food_stats SET foods_count = foods_count + 1 WHERE id = 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS food_stats_delete AFTER DELETE ON foods BEGIN
+        UPDATE food_stats SET foods_count = foods_count - 1 WHERE id = 1;
+    END;
+"""
+
+# Drops everything the triggers maintain, for bulk_food_load. user_version
+# is reset in the same script, so init_food_db rebuilds them on the next
+# start even if the import is interrupted.
+_DROP_DERIVED = """
+    PRAGMA user_version = 0;
+    DROP TRIGGER IF EXISTS foods_fts_insert;
+    DROP TRIGGER IF EXISTS foods_fts_update;
+    DROP TRIGGER IF EXISTS foods_fts_delete;
+    DROP TRIGGER IF EXISTS food_aliases_fts_insert;
+    DROP TRIGGER IF EXISTS food_aliases_fts_delete;
+    DROP TRIGGER IF EXISTS food_stats_insert;
+    DROP TRIGGER IF EXISTS food_stats_delete;
+    DROP TABLE IF EXISTS foods_fts;
+    DROP TABLE IF EXISTS food_stats;
+"""
+
+
+# Connection shared by the lookup helpers below. The web server runs each
+# request on a new thread, so a per-thread connection would be reopened
+# (and its pragmas re-run) for every request; this one is opened once and
+# used by one thread at a time
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.RLock()
+
+# Connection used only to poll PRAGMA data_version, which changes whenever
+# any other connection (another thread, an import script) commits to the
+# food database; the food lookup cache is dropped when it does
+_version_conn: Optional[sqlite3.Connection] = None
+_food_cache_version: Optional[int] = None
+_food_cache_lock = threading.Lock()
+
 
 def get_food_db_connection():
     """Get a connection to the food database."""
     return sqlite3.connect(FOOD_DB_PATH)
 
 
+@contextmanager
+def _food_connection():
+    """
+    Hold the shared connection to the food database for a block.
+    
+    Reusing it keeps the parsed schema and page cache warm between
+    requests instead of paying for open/close on every lookup. Callers
+    must not close it; scripts that want their own connection use
+    get_food_db_connection().
+    """
+    global _conn
+    
+    with _conn_lock:
+        if _conn is None:
+            conn = sqlite3.connect(FOOD_DB_PATH, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+            conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+            _conn = conn
+        yield _conn
+
+
 def init_food_db():
-    """Initialize the food database schema."""
+    """
+    Initialize the food database schema.
+    
+    The schema version is stored in PRAGMA user_version, so a database
+    that is already up to date costs one pragma read per start instead of
+    re-running every CREATE ... IF NOT EXISTS.
+    """
+    global FTS_AVAILABLE
+    
     os.makedirs(DATA_DIR, exist_ok=True)
     
     conn = get_food_db_connection()
     cursor = conn.cursor()
     
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version >= FOOD_SCHEMA_VERSION:
+        conn.close()
+        FTS_AVAILABLE = True
+        return
+    
+    # Every step is idempotent, so all of them run whenever the database
+    # is behind, whichever version it was at
+    # Version 1: foods, aliases, indexes and the full-text index
+    _create_schema(cursor)
+    fts_ready = _init_fts(cursor)
+    # Version 2: food count kept up to date by triggers
+    cursor.executescript(_STATS_SCHEMA)
+    
+    # Without FTS5 the version is left unset so the full-text index is
+    # retried on the next start
+    if fts_ready:
+        cursor.execute(f"PRAGMA user_version = {FOOD_SCHEMA_VERSION}")
+    
+    conn.commit()
+    conn.close()
+
+
+@contextmanager
+def bulk_food_load():
+    """
+    Suspend the full-text index and food count while rewriting many foods.
+    
+    Their triggers rewrite a food's whole full-text row for every alias
+    inserted, which makes bulk imports many times slower. Inside this
+    block they are dropped; afterwards init_food_db rebuilds both from the
+    tables in one pass each; search_foods and get_food_count fall back to
+    the tables meanwhile. Commit and close the import's connection before
+    the block ends.
+    """
+    conn = get_food_db_connection()
+    try:
+        conn.executescript(_DROP_DERIVED)
+    finally:
+        conn.close()
+    
+    try:
+        yield
+    finally:
+        init_food_db()
+
+
+def _create_schema(cursor):
+    """Create the foods and aliases tables and their indexes."""
     # Main foods table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS foods (
@@ -95,21 +300,44 @@ def init_food_db():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_food_category ON foods(category)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_alias_text ON food_aliases(alias)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_alias_food ON food_aliases(food_id)")
+    # Case-insensitive indexes so LIKE 'prefix%' can use an index seek
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_food_name_nocase ON foods(name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alias_text_nocase ON food_aliases(alias COLLATE NOCASE)")
+
+
+def _init_fts(cursor) -> bool:
+    """
+    Create the full-text index and fill it from existing foods on first run.
     
-    conn.commit()
-    conn.close()
+    Returns True if full-text search is available.
+    """
+    global FTS_AVAILABLE
+    
+    try:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'foods_fts'")
+        is_new = cursor.fetchone() is None
+        for statement in _FTS_SCHEMA:
+            cursor.execute(statement)
+    except sqlite3.OperationalError as e:
+        print(f"[Food DB] Full-text search not available, using LIKE search: {e}")
+        FTS_AVAILABLE = False
+        return False
+    
+    if is_new:
+        cursor.execute("""
+            INSERT INTO foods_fts (rowid, name, aliases)
+            SELECT f.id, f.name,
+                   COALESCE((SELECT group_concat(alias, ' ') FROM food_aliases WHERE food_id = f.id), '')
+            FROM foods f
+        """)
+    FTS_AVAILABLE = True
+    return True
 
 
 def get_unit_type(unit: str) -> Optional[str]:
     """Determine if unit is mass, volume, or piece."""
-    unit_lower = unit.lower().strip()
-    if unit_lower in MASS_CONVERSIONS:
-        return "mass"
-    elif unit_lower in VOLUME_CONVERSIONS:
-        return "volume"
-    elif unit_lower in PIECE_UNITS:
-        return "piece"
-    return None
+    entry = _UNIT_TABLE.get(unit.lower().strip())
+    return entry[2] if entry else None
 
 
 def convert_to_canonical(quantity: float, unit: str) -> tuple[float, str, str]:
@@ -119,17 +347,13 @@ def convert_to_canonical(quantity: float, unit: str) -> tuple[float, str, str]:
     """
     unit_lower = unit.lower().strip()
     
-    if unit_lower in MASS_CONVERSIONS:
-        factor = MASS_CONVERSIONS[unit_lower]
-        return (quantity * factor, "g", "mass")
-    elif unit_lower in VOLUME_CONVERSIONS:
-        factor = VOLUME_CONVERSIONS[unit_lower]
-        return (quantity * factor, "ml", "volume")
-    elif unit_lower in PIECE_UNITS:
-        return (quantity, "piece", "piece")
-    else:
+    entry = _UNIT_TABLE.get(unit_lower)
+    if entry is None:
         # Unknown unit, assume it's a valid canonical unit
         return (quantity, unit_lower, "unknown")
+    
+    factor, canonical_unit, unit_type = entry
+    return (quantity * factor, canonical_unit, unit_type)
 
 
 def parse_quantity(text: str) -> dict:
@@ -142,10 +366,8 @@ def parse_quantity(text: str) -> dict:
     
     text = text.strip().lower()
     
-    # Pattern: number (with optional decimal) followed by optional space and unit
     # Examples: "150g", "2.5 cups", "1 piece", "100 g"
-    pattern = r'^(\d+\.?\d*)\s*(.+)$'
-    match = re.match(pattern, text)
+    match = _QUANTITY_RE.match(text)
     
     if not match:
         return {"quantity": None, "unit": None, "valid": False}
@@ -169,28 +391,30 @@ def compute_calories(food_id: int, quantity: float, unit: str) -> dict:
     Compute calories for a given food and quantity.
     Returns {'calories': float, 'food_name': str, 'computed': bool, 'error': str|None}
     """
-    food = get_food_by_id(food_id)
-    if not food:
+    _validate_food_cache()
+    row = _get_food_row(food_id)
+    if not row:
         return {"calories": None, "computed": False, "error": "Food not found"}
+    _, food_name, calories_per_unit, food_unit_type, food_canonical_unit = row[:5]
     
-    # Convert input quantity to canonical unit
-    converted_qty, canonical_unit, input_unit_type = convert_to_canonical(quantity, unit)
+    # Conversion factor to the canonical unit in one lookup
+    factor, _, input_unit_type = _UNIT_TABLE.get(unit.lower().strip(), _UNKNOWN_UNIT)
     
     # Check if unit types match
-    if input_unit_type != food["unit_type"]:
+    if input_unit_type != food_unit_type:
         return {
             "calories": None,
             "computed": False,
-            "error": f"Unit mismatch: food uses {food['unit_type']} ({food['canonical_unit']}), but you specified {input_unit_type} ({unit})"
+            "error": f"Unit mismatch: food uses {food_unit_type} ({food_canonical_unit}), but you specified {input_unit_type} ({unit})"
         }
     
     # Compute calories
     # calories = quantity_in_canonical_units * calories_per_unit
-    calories = converted_qty * food["calories_per_unit"]
+    calories = quantity * factor * calories_per_unit
     
     return {
         "calories": round(calories, 1),
-        "food_name": food["name"],
+        "food_name": food_name,
         "food_id": food_id,
         "quantity": quantity,
         "unit": unit,
@@ -199,6 +423,104 @@ def compute_calories(food_id: int, quantity: float, unit: str) -> dict:
     }
 
 
+def _like_search(cursor, pattern: str) -> list[tuple]:
+    """Find foods whose name or an alias matches a LIKE pattern."""
+    cursor.execute("""
+        SELECT f.id, f.name, f.calories_per_unit, f.unit_type, f.canonical_unit, f.category
+        FROM foods f
+        WHERE f.name LIKE ?1 ESCAPE '\\'
+        UNION
+        SELECT f.id, f.name, f.calories_per_unit, f.unit_type, f.canonical_unit, f.category
+        FROM food_aliases a
+        JOIN foods f ON f.id = a.food_id
+        WHERE a.alias LIKE ?1 ESCAPE '\\'
+        LIMIT 200
+    """, (pattern,))
+    return cursor.fetchall()
+
+
+def _substring_matches(cursor, query_lower: str, rows: list[tuple]) -> list[tuple]:
+    """Foods whose name or an alias contains the query, minus those in rows."""
+    seen = {row[0] for row in rows}
+    query_escaped = query_lower.translate(_LIKE_ESCAPES)
+    return [
+        row for row in _like_search(cursor, f"%{query_escaped}%")
+        if row[0] not in seen
+    ]
+
+
+def _top_fuzzy_matches(query: str, names: list[str], indexes: list[int],
+                       limit: int, cutoff: Optional[float]) -> list[tuple[float, int]]:
+    """
+    Score names against the query with cdist and keep the best `limit`.
+    
+    argpartition selects the top scores without sorting every row; only
+    the selected ones are sorted (score descending, then row order, the
+    same order process.extract returns). Returns (score, index) pairs.
+    """
+    scores = process.cdist(
+        [query], names, scorer=fuzz.WRatio, processor=None, score_cutoff=cutoff
+    )[0]
+    
+    if len(scores) > limit:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.lexsort((top, -scores[top]))]
+    if cutoff is not None:
+        top = top[scores[top] >= cutoff]
+    
+    return [(float(scores[i]), indexes[i]) for i in top]
+
+
+def _fts_search(cursor, query_lower: str) -> list[tuple]:
+    """Find foods with a word of the name or an alias starting with each query word."""
+    # Every query word must prefix-match a word of the name or an alias;
+    # quoting each word keeps FTS5 query syntax out of user input
+    words = _QUERY_WORD_RE.findall(query_lower)
+    rows = []
+    if words:
+        match = " ".join(f'"{word}"*' for word in words)
+        cursor.execute("""
+            SELECT f.id, f.name, f.calories_per_unit, f.unit_type, f.canonical_unit, f.category
+            FROM foods_fts
+            JOIN foods f ON f.id = foods_fts.rowid
+            WHERE foods_fts MATCH ?
+            ORDER BY bm25(foods_fts)
+            LIMIT 200
+        """, (match,))
+        rows = cursor.fetchall()
+    if not rows:
+        # FTS only matches at the start of a word; only when nothing
+        # matched that way, look for mid-word matches (e.g. "aple" in
+        # "maple") with a substring scan, capped like the query above
+        query_escaped = query_lower.translate(_LIKE_ESCAPES)
+        rows = _like_search(cursor, f"%{query_escaped}%")
+    
+    return rows
+
+
+def _search_rows(cursor, query_lower: str, limit: int) -> list[tuple]:
+    """Find candidate rows for search_foods to rank."""
+    if FTS_AVAILABLE:
+        try:
+            return _fts_search(cursor, query_lower)
+        except sqlite3.OperationalError:
+            # foods_fts is dropped while bulk_food_load runs an import;
+            # answer from the tables with LIKE until it is rebuilt
+            pass
+    
+    # LIKE is already case-insensitive, and without LOWER() the
+    # anchored prefix search can seek the NOCASE indexes
+    query_escaped = query_lower.translate(_LIKE_ESCAPES)
+    rows = _like_search(cursor, f"{query_escaped}%")
+    if len(rows) < limit:
+        # Not enough prefix hits, fall back to a substring scan
+        rows += _substring_matches(cursor, query_lower, rows)
+    
+    return rows
+
+
 def search_foods(query: str, limit: int = 20) -> list[dict]:
     """
     Search foods by name and aliases using fuzzy matching.
@@ -207,30 +529,59 @@ def search_foods(query: str, limit: int = 20) -> list[dict]:
     if not query or len(query) < 2:
         return []
     
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    
     query_lower = query.lower()
     
-    # Search in both foods and aliases
-    cursor.execute("""
-        SELECT DISTINCT f.id, f.name, f.calories_per_unit, f.unit_type, f.canonical_unit, f.category
-        FROM foods f
-        LEFT JOIN food_aliases a ON f.id = a.food_id
-        WHERE LOWER(f.name) LIKE ? OR LOWER(a.alias) LIKE ?
-        LIMIT 200
-    """, (f"%{query_lower}%", f"%{query_lower}%"))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    with _food_connection() as conn:
+        rows = _search_rows(conn.cursor(), query_lower, limit)
     
     if not rows:
         return []
     
-    # Use fuzzy matching to rank results
+    # Cheap fast path for the common autocomplete case: exact, prefix and
+    # substring matches of the name get fixed scores without fuzzy scoring
+    ranked = []
+    other_indexes = []
+    names_lower = [row[1].lower() for row in rows]
+    for index, name in enumerate(names_lower):
+        if name == query_lower:
+            ranked.append((100.0, index))
+        elif name.startswith(query_lower):
+            ranked.append((95.0, index))
+        elif query_lower in name:
+            ranked.append((85.0, index))
+        else:
+            other_indexes.append(index)
+    
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    del ranked[limit:]
+    
+    if other_indexes:
+        # Fuzzy-score the rest in one batch call. When the fast path already
+        # filled the limit, only rows that could still make the cut are
+        # kept. No cutoff otherwise: rows that matched through an alias can
+        # score low against the name.
+        cutoff = ranked[-1][0] if len(ranked) == limit else None
+        other_names = [names_lower[index] for index in other_indexes]
+        if NUMPY_AVAILABLE:
+            ranked += _top_fuzzy_matches(query_lower, other_names, other_indexes, limit, cutoff)
+        else:
+            fuzzy = process.extract(
+                query_lower,
+                other_names,
+                scorer=fuzz.WRatio,
+                processor=None,  # already lowercased above
+                limit=limit,
+                score_cutoff=cutoff,
+            )
+            ranked += [(score, other_indexes[i]) for _, score, i in fuzzy]
+        # Stable sort, so fast-path rows stay ahead of equal fuzzy scores
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        del ranked[limit:]
+    
     foods = []
-    for row in rows:
-        food = {
+    for score, index in ranked:
+        row = rows[index]
+        foods.append({
             "id": row[0],
             "name": row[1],
             "calories_per_unit": row[2],
@@ -241,28 +592,39 @@ def search_foods(query: str, limit: int = 20) -> list[dict]:
             "calories": row[2],
             "serving_size": 1,
             "serving_unit": row[4],
-        }
-        # Calculate fuzzy score against food name
-        food["score"] = fuzz.WRatio(query_lower, row[1].lower())
-        foods.append(food)
+            "score": score,
+        })
+    return foods
+
+
+@lru_cache(maxsize=1024)
+def _get_food_row(food_id: int) -> Optional[tuple]:
+    """Fetch a food row by ID (cached; see _validate_food_cache)."""
+    with _food_connection() as conn:
+        cursor = conn.execute("""
+            SELECT id, name, calories_per_unit, unit_type, canonical_unit, category, fdc_id
+            FROM foods WHERE id = ?
+        """, (food_id,))
+        return cursor.fetchone()
+
+
+def _validate_food_cache():
+    """Drop cached food rows if the food database changed since they were read."""
+    global _version_conn, _food_cache_version
     
-    # Sort by score and return top results
-    foods.sort(key=lambda x: x["score"], reverse=True)
-    return foods[:limit]
+    with _food_cache_lock:
+        if _version_conn is None:
+            _version_conn = sqlite3.connect(FOOD_DB_PATH, check_same_thread=False)
+        version = _version_conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != _food_cache_version:
+            _get_food_row.cache_clear()
+            _food_cache_version = version
 
 
 def get_food_by_id(food_id: int) -> Optional[dict]:
     """Get a food item by ID."""
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, name, calories_per_unit, unit_type, canonical_unit, category, fdc_id
-        FROM foods WHERE id = ?
-    """, (food_id,))
-    
-    row = cursor.fetchone()
-    conn.close()
+    _validate_food_cache()
+    row = _get_food_row(food_id)
     
     if not row:
         return None
@@ -288,57 +650,46 @@ def add_food(
     aliases: list[str] = None
 ) -> int:
     """Add a food to the database. Returns the new food ID."""
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO foods (name, calories_per_unit, unit_type, canonical_unit, category, fdc_id)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (name, calories_per_unit, unit_type, canonical_unit, category, fdc_id))
-    
-    food_id = cursor.lastrowid
-    
-    # Add aliases if provided
-    if aliases:
-        for alias in aliases:
-            try:
-                cursor.execute("""
-                    INSERT INTO food_aliases (food_id, alias) VALUES (?, ?)
-                """, (food_id, alias.lower()))
-            except sqlite3.IntegrityError:
-                pass  # Ignore duplicate aliases
-    
-    conn.commit()
-    conn.close()
+    with _food_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            INSERT INTO foods (name, calories_per_unit, unit_type, canonical_unit, category, fdc_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (name, calories_per_unit, unit_type, canonical_unit, category, fdc_id))
+        
+        food_id = cursor.lastrowid
+        
+        # Add aliases if provided (OR IGNORE skips duplicate aliases)
+        if aliases:
+            cursor.executemany("""
+                INSERT OR IGNORE INTO food_aliases (food_id, alias) VALUES (?, ?)
+            """, [(food_id, alias.lower()) for alias in aliases])
+        
+        conn.commit()
     
     return food_id
 
 
 def add_alias(food_id: int, alias: str) -> bool:
     """Add an alias to a food. Returns True if successful."""
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
-            INSERT INTO food_aliases (food_id, alias) VALUES (?, ?)
-        """, (food_id, alias.lower()))
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        conn.close()
-        return False
+    with _food_connection() as conn:
+        try:
+            conn.execute("""
+                INSERT INTO food_aliases (food_id, alias) VALUES (?, ?)
+            """, (food_id, alias.lower()))
+            conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            return False
 
 
 def get_food_aliases(food_id: int) -> list[str]:
     """Get all aliases for a food."""
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT alias FROM food_aliases WHERE food_id = ?", (food_id,))
-    aliases = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    with _food_connection() as conn:
+        cursor = conn.execute("SELECT alias FROM food_aliases WHERE food_id = ?", (food_id,))
+        aliases = [row[0] for row in cursor.fetchall()]
     
     return aliases
 
@@ -349,23 +700,24 @@ def get_food_count() -> int:
         return 0
     
     try:
-        conn = get_food_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM foods")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        with _food_connection() as conn:
+            try:
+                row = conn.execute("SELECT foods_count FROM food_stats WHERE id = 1").fetchone()
+            except sqlite3.OperationalError:
+                # food_stats is dropped while bulk_food_load runs an import
+                row = conn.execute("SELECT COUNT(*) FROM foods").fetchone()
+        return row[0] if row else 0
     except sqlite3.OperationalError:
         return 0
 
 
 def get_food_categories() -> list[str]:
     """Get all unique food categories."""
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT category FROM foods WHERE category IS NOT NULL ORDER BY category")
-    categories = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    with _food_connection() as conn:
+        cursor = conn.execute(
+            "SELECT DISTINCT category FROM foods WHERE category IS NOT NULL ORDER BY category"
+        )
+        categories = [row[0] for row in cursor.fetchall()]
     return categories
 
 
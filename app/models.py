@@ -1,10 +1,53 @@
 """SQLAlchemy models for health data."""
 
 from datetime import datetime, date, time
+from sqlalchemy.orm import deferred
 from app import db
 
 
-class WeightEntry(db.Model):
+class DateRangeMixin:
+    """
+    Chart query helper for entry models with a `date` column.
+    
+    These models mark `created_at` as deferred: it is only used to detect
+    new data, so loading entries doesn't fetch it unless it is accessed.
+    It is indexed so the latest change is found with one index seek.
+    """
+    
+    @classmethod
+    def rows_for_range(cls, start_date: date, end_date: date, *columns, **filters) -> list:
+        """
+        Fetch (date, *columns) tuples for a date range, ordered by date.
+        
+        Returns plain rows rather than model instances, so chart code skips
+        ORM object construction and instrumented attribute access.
+        """
+        query = (
+            db.select(cls.date, *columns)
+            .filter_by(**filters)
+            .where(cls.date >= start_date, cls.date <= end_date)
+            .order_by(cls.date)
+        )
+        return db.session.execute(query).all()
+    
+    @classmethod
+    def daily_totals(cls, start_date: date, end_date: date, aggregate) -> list:
+        """
+        Fetch (date, aggregate) rows per day for a date range, ordered by date.
+        
+        `aggregate` is a SQL aggregate such as db.func.count(), so grouping
+        happens in SQLite instead of over every entry in Python.
+        """
+        query = (
+            db.select(cls.date, aggregate)
+            .where(cls.date >= start_date, cls.date <= end_date)
+            .group_by(cls.date)
+            .order_by(cls.date)
+        )
+        return db.session.execute(query).all()
+
+
+class WeightEntry(DateRangeMixin, db.Model):
     """Daily weight measurement."""
     
     __tablename__ = "weight_entries"
@@ -12,7 +55,7 @@ class WeightEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False, unique=True, index=True)
     weight_kg = db.Column(db.Float, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = deferred(db.Column(db.DateTime, default=datetime.utcnow, index=True))
     
     def __repr__(self):
         return f"<WeightEntry {self.date}: {self.weight_kg}kg>"
@@ -25,7 +68,7 @@ class WeightEntry(db.Model):
         }
 
 
-class SleepEntry(db.Model):
+class SleepEntry(DateRangeMixin, db.Model):
     """Daily sleep duration."""
     
     __tablename__ = "sleep_entries"
@@ -33,7 +76,7 @@ class SleepEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False, unique=True, index=True)
     hours = db.Column(db.Float, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = deferred(db.Column(db.DateTime, default=datetime.utcnow, index=True))
     
     def __repr__(self):
         return f"<SleepEntry {self.date}: {self.hours}h>"
@@ -46,7 +89,7 @@ class SleepEntry(db.Model):
         }
 
 
-class WakeTimeEntry(db.Model):
+class WakeTimeEntry(DateRangeMixin, db.Model):
     """Daily wake-up time."""
     
     __tablename__ = "wake_time_entries"
@@ -54,7 +97,7 @@ class WakeTimeEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False, unique=True, index=True)
     wake_time = db.Column(db.Time, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = deferred(db.Column(db.DateTime, default=datetime.utcnow, index=True))
     
     def __repr__(self):
         return f"<WakeTimeEntry {self.date}: {self.wake_time}>"
@@ -67,7 +110,7 @@ class WakeTimeEntry(db.Model):
         }
 
 
-class WorkoutEntry(db.Model):
+class WorkoutEntry(DateRangeMixin, db.Model):
     """Workout log entry."""
     
     __tablename__ = "workout_entries"
@@ -77,7 +120,10 @@ class WorkoutEntry(db.Model):
     workout_type = db.Column(db.String(100), nullable=False)
     duration_minutes = db.Column(db.Integer, nullable=True)
     notes = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = deferred(db.Column(db.DateTime, default=datetime.utcnow, index=True))
+    
+    # Covering index: date-range reads of durations never touch the table
+    __table_args__ = (db.Index("ix_workout_date_duration", "date", "duration_minutes"),)
     
     def __repr__(self):
         return f"<WorkoutEntry {self.date}: {self.workout_type}>"
@@ -92,7 +138,7 @@ class WorkoutEntry(db.Model):
         }
 
 
-class CalorieEntry(db.Model):
+class CalorieEntry(DateRangeMixin, db.Model):
     """Calorie intake entry."""
     
     __tablename__ = "calorie_entries"
@@ -103,7 +149,10 @@ class CalorieEntry(db.Model):
     calories = db.Column(db.Float, nullable=False)
     quantity = db.Column(db.String(50), nullable=True)  # e.g., "150g", "2 cups"
     food_id = db.Column(db.Integer, nullable=True)  # Reference to foods table (if computed)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = deferred(db.Column(db.DateTime, default=datetime.utcnow, index=True))
+    
+    # Covering index: daily calorie totals are read from the index alone
+    __table_args__ = (db.Index("ix_calorie_date_calories", "date", "calories"),)
     
     def __repr__(self):
         return f"<CalorieEntry {self.date}: {self.meal_name} ({self.calories} cal)>"
@@ -176,7 +225,7 @@ class CustomMetric(db.Model):
         }
 
 
-class CustomMetricEntry(db.Model):
+class CustomMetricEntry(DateRangeMixin, db.Model):
     """Entry for a user-defined custom metric."""
     
     __tablename__ = "custom_metric_entries"
@@ -186,10 +235,14 @@ class CustomMetricEntry(db.Model):
     date = db.Column(db.Date, nullable=False, index=True)
     value = db.Column(db.Float, nullable=False)
     notes = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    # Unique constraint: one entry per metric per date
-    __table_args__ = (db.UniqueConstraint('metric_id', 'date', name='uix_metric_date'),)
+    created_at = deferred(db.Column(db.DateTime, default=datetime.utcnow, index=True))
+    
+    # Unique constraint: one entry per metric per date, plus a covering
+    # index for per-metric chart reads
+    __table_args__ = (
+        db.UniqueConstraint('metric_id', 'date', name='uix_metric_date'),
+        db.Index("ix_metric_entry_metric_date_value", "metric_id", "date", "value"),
+    )
     
     def __repr__(self):
         return f"<CustomMetricEntry {self.metric_id} {self.date}: {self.value}>"
@@ -1,6 +1,9 @@
 """Pool schedule logic with regular hours and exception dates."""
 
-from datetime import datetime, date, time
+from bisect import bisect_right
+from datetime import datetime, date, time, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 
 # Regular weekly schedule: day_of_week (0=Monday) -> list of (start_time, end_time) tuples
@@ -35,17 +38,17 @@ REGULAR_SCHEDULE = {
 }
 
 # Exception dates for 2025
-# Format: date -> what's cancelled ("all", "midday", "evening")
-EXCEPTIONS = {
-    # No 11-1 PM swim
-    date(2025, 2, 12): "midday",
-    
+# Format: date -> what's cancelled ("all", "midday", "evening", "midday_and_evening")
+# Read-only, since get_sessions_for_date caches its results per date
+EXCEPTIONS = MappingProxyType({
     # No evening swim
     date(2025, 1, 16): "evening",
     date(2025, 1, 30): "evening",
-    # Feb 12 already has midday cancelled, add evening too
     date(2025, 3, 6): "evening",
     
+    # No midday or evening swim (morning session only)
+    date(2025, 2, 12): "midday_and_evening",
+    
     # Closed all day
     date(2025, 1, 18): "all",
     date(2025, 2, 1): "all",
@@ -56,55 +59,115 @@ EXCEPTIONS = {
     date(2025, 2, 28): "all",
     date(2025, 3, 1): "all",
     date(2025, 3, 8): "all",
+})
+
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Which regular sessions survive each exception type (None = no exception)
+_EXCEPTION_FILTERS = {
+    None: lambda session: True,
+    "midday": lambda session: session[0].hour != 11,
+    "evening": lambda session: session[0].hour < 17,
+    "midday_and_evening": lambda session: session[0].hour < 11,
+    "all": lambda session: False,
 }
 
-# Feb 12 has both midday and evening cancelled
-EXCEPTIONS[date(2025, 2, 12)] = "midday_and_evening"
 
-DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# For each weekday, the day offsets (1-7) within the next week that fall on
+# a weekday with regular sessions; other days can't have any
+_OPEN_DAY_OFFSETS = tuple(
+    tuple(
+        offset for offset in range(1, 8)
+        if REGULAR_SCHEDULE.get((day + offset) % 7)
+    )
+    for day in range(7)
+)
+
+# Status message shown on days with an exception
+_EXCEPTION_MESSAGES = {
+    "all": "Closed today (scheduled closure)",
+    "midday": "No 11AM-1PM session today",
+    "evening": "No evening session today",
+    "midday_and_evening": "Only morning session today",
+}
 
 
-def format_time(t: time) -> str:
-    """Format time as 12-hour string."""
-    hour = t.hour
-    minute = t.minute
+def _minutes(t: time) -> int:
+    """Minutes since midnight."""
+    return t.hour * 60 + t.minute
+
+
+# Effective sessions per (weekday, exception type) as (start, end) minutes
+# since midnight, computed once so a date lookup returns a shared tuple and
+# checks against the current time are plain integer comparisons
+_EFFECTIVE_SESSIONS = {
+    (day, exception): tuple(
+        (_minutes(start), _minutes(end))
+        for start, end in filter(keep, REGULAR_SCHEDULE.get(day, []))
+    )
+    for day in range(7)
+    for exception, keep in _EXCEPTION_FILTERS.items()
+}
+
+# The same sessions flattened to sorted boundaries [start0, end0, start1,
+# end1, ...]; sessions don't overlap, so a minute that bisects to an even
+# index falls inside a session
+_SESSION_BOUNDS = {
+    key: tuple(minutes for session in sessions for minutes in session)
+    for key, sessions in _EFFECTIVE_SESSIONS.items()
+}
+
+
+def format_time(minutes: int) -> str:
+    """Format minutes since midnight as 12-hour string."""
+    hour, minute = divmod(minutes, 60)
+    hour_12 = (hour + 11) % 12 + 1  # 0 -> 12, 13 -> 1
     am_pm = "AM" if hour < 12 else "PM"
-    if hour == 0:
-        hour = 12
-    elif hour > 12:
-        hour -= 12
-    if minute == 0:
-        return f"{hour}{am_pm}"
-    return f"{hour}:{minute:02d}{am_pm}"
+    if minute:
+        return f"{hour_12}:{minute:02d}{am_pm}"
+    return f"{hour_12}{am_pm}"
 
 
-def format_session(start: time, end: time) -> str:
+def format_session(start: int, end: int) -> str:
     """Format a session as a time range string."""
     return f"{format_time(start)}-{format_time(end)}"
 
 
-def get_sessions_for_date(d: date) -> list[tuple[time, time]]:
-    """Get pool sessions for a specific date, accounting for exceptions."""
-    # Check if completely closed
-    exception = EXCEPTIONS.get(d)
-    if exception == "all":
-        return []
-    
-    # Get regular schedule for this day of week
-    sessions = REGULAR_SCHEDULE.get(d.weekday(), []).copy()
-    
-    if not sessions:
-        return []
-    
-    # Filter based on exception type
-    if exception == "midday":
-        sessions = [s for s in sessions if not (s[0].hour == 11)]
-    elif exception == "evening":
-        sessions = [s for s in sessions if s[0].hour < 17]
-    elif exception == "midday_and_evening":
-        sessions = [s for s in sessions if s[0].hour < 11]
+# Display strings for every session time and session in the schedule,
+# so status lookups don't format strings per request
+_SESSION_STR = {
+    session: format_session(*session)
+    for sessions in _EFFECTIVE_SESSIONS.values()
+    for session in sessions
+}
+_TIME_STR = {
+    minutes: format_time(minutes)
+    for session in _SESSION_STR
+    for minutes in session
+}
+
+# The regular weekly schedule never changes, so its display rows are
+# built once
+_WEEKLY_SCHEDULE = tuple(
+    {
+        "day": day_name,
+        "sessions": ", ".join(
+            _SESSION_STR[session] for session in _EFFECTIVE_SESSIONS[(day_idx, None)]
+        ) or "CLOSED",
+    }
+    for day_idx, day_name in enumerate(DAY_NAMES)
+)
+
+
+@lru_cache(maxsize=1024)
+def get_sessions_for_date(d: date) -> tuple[tuple[int, int], ...]:
+    """
+    Get pool sessions for a specific date, accounting for exceptions.
     
-    return sessions
+    Sessions are (start, end) minutes since midnight. Cached per date;
+    the returned tuples are shared, so they are immutable.
+    """
+    return _EFFECTIVE_SESSIONS[(d.weekday(), EXCEPTIONS.get(d))]
 
 
 def is_pool_open_now(now: Optional[datetime] = None) -> tuple[bool, Optional[str]]:
@@ -115,12 +178,13 @@ def is_pool_open_now(now: Optional[datetime] = None) -> tuple[bool, Optional[str
     if now is None:
         now = datetime.now()
     
-    current_time = now.time()
-    sessions = get_sessions_for_date(now.date())
+    # A session is open from its start minute until its end minute begins
+    today = now.date()
+    bounds = _SESSION_BOUNDS[(today.weekday(), EXCEPTIONS.get(today))]
+    index = bisect_right(bounds, now.hour * 60 + now.minute)
     
-    for start, end in sessions:
-        if start <= current_time <= end:
-            return True, format_time(end)
+    if index % 2:
+        return True, _TIME_STR[bounds[index]]
     
     return False, None
 
@@ -130,29 +194,29 @@ def get_next_session(now: Optional[datetime] = None) -> Optional[dict]:
     if now is None:
         now = datetime.now()
     
-    current_time = now.time()
     current_date = now.date()
-    
+    return _next_session(
+        current_date, now.hour * 60 + now.minute, get_sessions_for_date(current_date)
+    )
+
+
+def _next_session(current_date: date, current_minute: int,
+                  sessions: tuple[tuple[int, int], ...]) -> Optional[dict]:
+    """Find the next session after current_minute, given today's sessions."""
     # Check remaining sessions today
-    sessions = get_sessions_for_date(current_date)
     for start, end in sessions:
-        if start > current_time:
+        if start > current_minute:
             return {
                 "date": current_date,
                 "day_name": "Today",
-                "start": format_time(start),
-                "end": format_time(end),
-                "session_str": format_session(start, end),
+                "start": _TIME_STR[start],
+                "end": _TIME_STR[end],
+                "session_str": _SESSION_STR[(start, end)],
             }
     
-    # Check next 7 days
-    for days_ahead in range(1, 8):
-        future_date = date(current_date.year, current_date.month, current_date.day)
-        try:
-            future_date = date.fromordinal(current_date.toordinal() + days_ahead)
-        except ValueError:
-            continue
-        
+    # Check the open days among the next 7
+    for days_ahead in _OPEN_DAY_OFFSETS[current_date.weekday()]:
+        future_date = current_date + timedelta(days=days_ahead)
         sessions = get_sessions_for_date(future_date)
         if sessions:
             start, end = sessions[0]
@@ -160,52 +224,72 @@ def get_next_session(now: Optional[datetime] = None) -> Optional[dict]:
             return {
                 "date": future_date,
                 "day_name": day_name,
-                "start": format_time(start),
-                "end": format_time(end),
-                "session_str": format_session(start, end),
+                "start": _TIME_STR[start],
+                "end": _TIME_STR[end],
+                "session_str": _SESSION_STR[(start, end)],
             }
     
     return None
 
 
+def get_sessions_between(start_date: date, end_date: date) -> list[tuple[date, int, int]]:
+    """
+    Get all sessions from start_date up to (not including) end_date.
+    
+    Returns (date, start, end) tuples, start/end in minutes since
+    midnight, for multi-day views.
+    """
+    sessions = []
+    for days_ahead in range((end_date - start_date).days):
+        d = start_date + timedelta(days=days_ahead)
+        sessions.extend((d, start, end) for start, end in get_sessions_for_date(d))
+    return sessions
+
+
 def get_pool_status(now: Optional[datetime] = None) -> dict:
-    """Get complete pool status for display."""
+    """
+    Get complete pool status for display.
+    
+    The status only changes from one minute to the next, so it is cached
+    per minute; callers get a shallow copy.
+    """
     if now is None:
         now = datetime.now()
     
-    is_open, closes_at = is_pool_open_now(now)
-    sessions_today = get_sessions_for_date(now.date())
-    next_session = get_next_session(now)
+    # Split the current time once; the cache is keyed on the parts
+    return dict(_pool_status(now.date(), now.hour * 60 + now.minute))
+
+
+@lru_cache(maxsize=8)
+def _pool_status(today: date, current_minute: int) -> dict:
+    """Build the pool status for a date and minute since midnight."""
+    sessions_today = get_sessions_for_date(today)
+    next_session = _next_session(today, current_minute, sessions_today)
     
-    # Format today's sessions
+    # Format today's sessions, noting the open one (if any) on the way
+    is_open = False
+    closes_at = None
     today_sessions_str = []
-    current_time = now.time()
     for start, end in sessions_today:
-        session_str = format_session(start, end)
-        if start <= current_time <= end:
+        session_str = _SESSION_STR[(start, end)]
+        if start <= current_minute < end:
             status = "now"
-        elif end < current_time:
+            if not is_open:
+                is_open = True
+                closes_at = _TIME_STR[end]
+        elif end <= current_minute:
             status = "past"
         else:
             status = "upcoming"
         today_sessions_str.append({"time": session_str, "status": status})
     
     # Check for exception message
-    exception = EXCEPTIONS.get(now.date())
-    exception_msg = None
-    if exception == "all":
-        exception_msg = "Closed today (scheduled closure)"
-    elif exception == "midday":
-        exception_msg = "No 11AM-1PM session today"
-    elif exception == "evening":
-        exception_msg = "No evening session today"
-    elif exception == "midday_and_evening":
-        exception_msg = "Only morning session today"
+    exception_msg = _EXCEPTION_MESSAGES.get(EXCEPTIONS.get(today))
     
     return {
         "is_open": is_open,
         "closes_at": closes_at,
-        "day_name": DAY_NAMES[now.weekday()],
+        "day_name": DAY_NAMES[today.weekday()],
         "sessions_today": today_sessions_str,
         "is_closed_today": len(sessions_today) == 0,
         "next_session": next_session,
@@ -215,12 +299,4 @@ def get_pool_status(now: Optional[datetime] = None) -> dict:
 
 def get_weekly_schedule() -> list[dict]:
     """Get the regular weekly schedule for display."""
-    schedule = []
-    for day_idx, day_name in enumerate(DAY_NAMES):
-        sessions = REGULAR_SCHEDULE.get(day_idx, [])
-        if sessions:
-            sessions_str = ", ".join(format_session(s, e) for s, e in sessions)
-        else:
-            sessions_str = "CLOSED"
-        schedule.append({"day": day_name, "sessions": sessions_str})
-    return schedule
+    return list(_WEEKLY_SCHEDULE)
@@ -3,12 +3,26 @@
 import csv
 import io
 import json
-from datetime import datetime, date, timedelta
+import os
+from datetime import datetime, date, time, timedelta
+from itertools import groupby
+from operator import itemgetter
 from statistics import mean, median
+from typing import Optional
 
-from flask import Blueprint, render_template, request, jsonify, Response
-import plotly.graph_objects as go
-import plotly.utils
+from flask import Blueprint, render_template, request, jsonify, Response, stream_with_context
+import plotly.io as pio
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# orjson available flag (faster chart JSON, falls back to stdlib json)
+ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+    
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
 
 from app import db
 from app.models import (
@@ -28,22 +42,20 @@ from app.validation import (
 main_bp = Blueprint("main", __name__)
 
 
+# Dashboard time windows -> length of the date range (anything else is 1 month)
+WINDOW_DAYS = {
+    "1w": timedelta(days=7),
+    "1m": timedelta(days=30),
+    "3m": timedelta(days=90),
+    "6m": timedelta(days=180),
+    "1y": timedelta(days=365),
+}
+
+
 def get_date_range(window: str) -> tuple[date, date]:
     """Get start and end dates based on time window selection."""
     end_date = date.today()
-    
-    if window == "1w":
-        start_date = end_date - timedelta(days=7)
-    elif window == "3m":
-        start_date = end_date - timedelta(days=90)
-    elif window == "6m":
-        start_date = end_date - timedelta(days=180)
-    elif window == "1y":
-        start_date = end_date - timedelta(days=365)
-    else:  # Default: 1 month
-        start_date = end_date - timedelta(days=30)
-    
-    return start_date, end_date
+    return end_date - WINDOW_DAYS.get(window, WINDOW_DAYS["1m"]), end_date
 
 
 def calculate_metrics(values: list[float]) -> dict:
@@ -58,8 +70,11 @@ def calculate_metrics(values: list[float]) -> dict:
             "count": 0,
         }
     
+    # Plain statistics/min/max on purpose: chart series are a few dozen
+    # points, too few for NumPy's array conversion to pay off (it measured
+    # slower than this path at 30 values)
     return {
-        "latest": values[-1] if values else None,
+        "latest": values[-1],
         "average": round(mean(values), 2),
         "median": round(median(values), 2),
         "min": round(min(values), 2),
@@ -68,105 +83,138 @@ def calculate_metrics(values: list[float]) -> dict:
     }
 
 
+# Layout shared by every dashboard chart. It is sent to the page once
+# (chart_layout) and merged with each chart's own title and y axis there.
+# The dark theme is expanded here because plotly.js only knows its
+# contents, not Python-side template names; to_plotly_json() gives plain
+# JSON types, so no Plotly encoder is involved.
+_CHART_GRID_COLOR = "rgba(255,255,255,0.1)"
+_CHART_LAYOUT = {
+    "template": pio.templates["plotly_dark"].to_plotly_json(),
+    "margin": {"l": 50, "r": 30, "t": 50, "b": 50},
+    "xaxis": {"title": {"text": "Date"}, "gridcolor": _CHART_GRID_COLOR},
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "height": 300,
+}
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+_CHART_LAYOUT_JSON = _dumps(_CHART_LAYOUT)
+
+
+def _chart_json(trace: dict, title: str, y_label: str) -> str:
+    """
+    Serialize a one-trace chart as {"data": [...], "layout": {...}}.
+    
+    Only the chart-specific layout (title, y axis) is included; the page
+    merges it over the shared _CHART_LAYOUT. Built as plain dicts rather
+    than a go.Figure, skipping Plotly's validation and encoder.
+    """
+    return _dumps({
+        "data": [trace],
+        "layout": {
+            "title": {"font": {"size": 16}, "text": title},
+            "yaxis": {"title": {"text": y_label}, "gridcolor": _CHART_GRID_COLOR},
+        },
+    })
+
+
 def create_line_chart(dates: list, values: list, title: str, y_label: str, color: str = "#3b82f6") -> str:
     """Create a Plotly line chart and return as JSON."""
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=dates,
-        y=values,
-        mode="lines+markers",
-        name=title,
-        line=dict(color=color, width=2),
-        marker=dict(size=6),
-    ))
-    
-    fig.update_layout(
-        title=dict(text=title, font=dict(size=16)),
-        xaxis_title="Date",
-        yaxis_title=y_label,
-        template="plotly_dark",
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(l=50, r=30, t=50, b=50),
-        height=300,
-    )
-    
-    fig.update_xaxes(gridcolor="rgba(255,255,255,0.1)")
-    fig.update_yaxes(gridcolor="rgba(255,255,255,0.1)")
-    
-    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+    return _chart_json({
+        "line": {"color": color, "width": 2},
+        "marker": {"size": 6},
+        "mode": "lines+markers",
+        "name": title,
+        "x": dates,
+        "y": values,
+        "type": "scatter",
+    }, title, y_label)
 
 
 def create_bar_chart(dates: list, values: list, title: str, y_label: str, color: str = "#10b981") -> str:
     """Create a Plotly bar chart and return as JSON."""
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=dates,
-        y=values,
-        name=title,
-        marker_color=color,
-    ))
-    
-    fig.update_layout(
-        title=dict(text=title, font=dict(size=16)),
-        xaxis_title="Date",
-        yaxis_title=y_label,
-        template="plotly_dark",
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(l=50, r=30, t=50, b=50),
-        height=300,
-    )
-    
-    fig.update_xaxes(gridcolor="rgba(255,255,255,0.1)")
-    fig.update_yaxes(gridcolor="rgba(255,255,255,0.1)")
-    
-    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+    return _chart_json({
+        "marker": {"color": color},
+        "name": title,
+        "x": dates,
+        "y": values,
+        "type": "bar",
+    }, title, y_label)
 
 
-@main_bp.route("/")
-def dashboard():
-    """Main dashboard view."""
-    window = request.args.get("window", "1m")
-    start_date, end_date = get_date_range(window)
+def _database_state() -> Optional[tuple]:
+    """
+    Identify the current contents of the health database by file stats.
     
-    # Fetch data within date range
-    weight_entries = WeightEntry.query.filter(
-        WeightEntry.date >= start_date,
-        WeightEntry.date <= end_date
-    ).order_by(WeightEntry.date).all()
+    Every commit, from this process or another one (the alarm daemon's
+    autofill, scripts), changes the mtime or size of the database file
+    or its WAL file. Returns None if the database isn't a SQLite file.
+    """
+    url = db.engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
     
-    sleep_entries = SleepEntry.query.filter(
-        SleepEntry.date >= start_date,
-        SleepEntry.date <= end_date
-    ).order_by(SleepEntry.date).all()
+    state = []
+    for path in (url.database, url.database + "-wal"):
+        try:
+            st = os.stat(path)
+            state.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            state.append(None)
+    return tuple(state)
+
+
+# Rendered dashboard charts: window length in days -> ((end date,
+# database state), charts)
+_chart_cache: dict = {}
+
+
+def _get_charts(start_date: date, end_date: date) -> dict:
+    """Get the dashboard charts and metrics, rebuilt only when data changed."""
+    # Taken before reading, so a write during the build isn't missed
+    state = _database_state()
+    key = (end_date, state)
     
-    wake_entries = WakeTimeEntry.query.filter(
-        WakeTimeEntry.date >= start_date,
-        WakeTimeEntry.date <= end_date
-    ).order_by(WakeTimeEntry.date).all()
+    cache_slot = (end_date - start_date).days
+    cached = _chart_cache.get(cache_slot)
+    if state is not None and cached is not None and cached[0] == key:
+        return cached[1]
     
-    workout_entries = WorkoutEntry.query.filter(
-        WorkoutEntry.date >= start_date,
-        WorkoutEntry.date <= end_date
-    ).order_by(WorkoutEntry.date).all()
+    charts = _build_charts(start_date, end_date)
+    if state is not None:
+        _chart_cache[cache_slot] = (key, charts)
+    return charts
+
+
+def _build_charts(start_date: date, end_date: date) -> dict:
+    """Build the dashboard charts and metrics for a date range."""
+    # Fetch data within date range as (date, value) rows
+    weight_rows = WeightEntry.rows_for_range(start_date, end_date, WeightEntry.weight_kg)
+    sleep_rows = SleepEntry.rows_for_range(start_date, end_date, SleepEntry.hours)
+    wake_rows = WakeTimeEntry.rows_for_range(start_date, end_date, WakeTimeEntry.wake_time)
     
     # Prepare chart data (stored as kg internally, display as lbs)
-    weight_dates = [e.date.isoformat() for e in weight_entries]
-    weight_values = [e.weight_kg for e in weight_entries]  # Now stored as lbs despite column name
+    weight_dates = [d.isoformat() for d, _ in weight_rows]
+    weight_values = [w for _, w in weight_rows]  # Now stored as lbs despite column name
     weight_chart = create_line_chart(weight_dates, weight_values, "Weight", "lbs", "#3b82f6")
     weight_metrics = calculate_metrics(weight_values)
     
-    sleep_dates = [e.date.isoformat() for e in sleep_entries]
-    sleep_values = [e.hours for e in sleep_entries]
+    sleep_dates = [d.isoformat() for d, _ in sleep_rows]
+    sleep_values = [h for _, h in sleep_rows]
     sleep_chart = create_bar_chart(sleep_dates, sleep_values, "Sleep Duration", "hours", "#8b5cf6")
     sleep_metrics = calculate_metrics(sleep_values)
     
     # Wake time as decimal hours for graphing
-    wake_dates = [e.date.isoformat() for e in wake_entries]
-    wake_values = [e.wake_time.hour + e.wake_time.minute / 60 for e in wake_entries]
+    wake_dates = [d.isoformat() for d, _ in wake_rows]
+    wake_values = [t.hour + t.minute / 60 for _, t in wake_rows]
     wake_chart = create_line_chart(wake_dates, wake_values, "Wake Time", "hour", "#f59e0b")
     wake_metrics = calculate_metrics(wake_values)
     if wake_metrics["latest"]:
@@ -178,66 +226,52 @@ def dashboard():
         wake_metrics["latest_formatted"] = "N/A"
     
     # Workout count per day
-    workout_by_date = {}
-    for e in workout_entries:
-        d = e.date.isoformat()
-        workout_by_date[d] = workout_by_date.get(d, 0) + 1
-    workout_dates = sorted(workout_by_date.keys())
-    workout_values = [workout_by_date[d] for d in workout_dates]
+    workout_rows = WorkoutEntry.daily_totals(start_date, end_date, db.func.count())
+    workout_dates = [d.isoformat() for d, _ in workout_rows]
+    workout_values = [count for _, count in workout_rows]
     workout_chart = create_bar_chart(workout_dates, workout_values, "Workouts", "count", "#10b981")
     workout_metrics = {
-        "total": len(workout_entries),
-        "days_with_workout": len(workout_by_date),
+        "total": sum(workout_values),
+        "days_with_workout": len(workout_rows),
     }
     
-    # Calorie data
-    calorie_entries = CalorieEntry.query.filter(
-        CalorieEntry.date >= start_date,
-        CalorieEntry.date <= end_date
-    ).order_by(CalorieEntry.date).all()
-    
-    # Group calories by date
-    calories_by_date = {}
-    for e in calorie_entries:
-        d = e.date.isoformat()
-        if d not in calories_by_date:
-            calories_by_date[d] = 0
-        calories_by_date[d] += e.calories
-    
-    calorie_dates = sorted(calories_by_date.keys())
-    calorie_values = [calories_by_date[d] for d in calorie_dates]
+    # Calories per day
+    calorie_rows = CalorieEntry.daily_totals(
+        start_date, end_date, db.func.sum(CalorieEntry.calories)
+    )
+    calorie_dates = [d.isoformat() for d, _ in calorie_rows]
+    calorie_values = [calories for _, calories in calorie_rows]
     calorie_chart = create_bar_chart(calorie_dates, calorie_values, "Daily Calories", "kcal", "#ef4444")
     calorie_metrics = calculate_metrics(calorie_values)
     
-    # Today's calories breakdown
-    today_entries = CalorieEntry.query.filter(
-        CalorieEntry.date == date.today()
-    ).order_by(CalorieEntry.created_at).all()
-    today_calories = sum(e.calories for e in today_entries)
-    
-    # Get presets for quick-add
-    presets = MealPreset.query.order_by(MealPreset.category, MealPreset.name).all()
-    
-    # Food database status
-    food_count = get_food_count()
-    
-    # Pool schedule
-    pool_status = get_pool_status()
-    pool_weekly = get_weekly_schedule()
+    # The range ends today, so today's total is the last daily total (if any)
+    today_calories = calorie_values[-1] if calorie_rows and calorie_rows[-1][0] == end_date else 0
     
     # Custom metrics
     custom_metrics = CustomMetric.query.order_by(CustomMetric.name).all()
     custom_charts = []
     
+    # Entries for all metrics in one query (read from the covering
+    # metric/date/value index), grouped by metric
+    entries_by_metric = {}
+    if custom_metrics:
+        metric_entries = db.session.execute(
+            db.select(CustomMetricEntry.metric_id, CustomMetricEntry.date, CustomMetricEntry.value)
+            .where(
+                CustomMetricEntry.metric_id.in_([metric.id for metric in custom_metrics]),
+                CustomMetricEntry.date >= start_date,
+                CustomMetricEntry.date <= end_date,
+            )
+            .order_by(CustomMetricEntry.metric_id, CustomMetricEntry.date)
+        )
+        for metric_id, entries in groupby(metric_entries, key=itemgetter(0)):
+            entries_by_metric[metric_id] = [(d, v) for _, d, v in entries]
+    
     for metric in custom_metrics:
-        entries = CustomMetricEntry.query.filter(
-            CustomMetricEntry.metric_id == metric.id,
-            CustomMetricEntry.date >= start_date,
-            CustomMetricEntry.date <= end_date
-        ).order_by(CustomMetricEntry.date).all()
+        entries = entries_by_metric.get(metric.id, [])
         
-        dates = [e.date.isoformat() for e in entries]
-        values = [e.value for e in entries]
+        dates = [d.isoformat() for d, _ in entries]
+        values = [v for _, v in entries]
         
         if metric.chart_type == "line":
             chart_json = create_line_chart(dates, values, metric.name, metric.unit, metric.color)
@@ -257,49 +291,85 @@ def dashboard():
             "metrics": metrics_data,
         })
     
+    return {
+        "weight_chart": weight_chart,
+        "weight_metrics": weight_metrics,
+        "sleep_chart": sleep_chart,
+        "sleep_metrics": sleep_metrics,
+        "wake_chart": wake_chart,
+        "wake_metrics": wake_metrics,
+        "workout_chart": workout_chart,
+        "workout_metrics": workout_metrics,
+        "calorie_chart": calorie_chart,
+        "calorie_metrics": calorie_metrics,
+        "today_calories": today_calories,
+        "custom_charts": custom_charts,
+    }
+
+
+@main_bp.route("/")
+def dashboard():
+    """Main dashboard view."""
+    window = request.args.get("window", "1m")
+    start_date, end_date = get_date_range(window)
+    
+    # Charts (and today's calorie total) are cached until the data changes
+    charts = _get_charts(start_date, end_date)
+    
+    # Get presets for quick-add
+    presets = MealPreset.query.order_by(MealPreset.category, MealPreset.name).all()
+    
+    # Food database status
+    food_count = get_food_count()
+    
+    # Pool schedule
+    pool_status = get_pool_status()
+    pool_weekly = get_weekly_schedule()
+    
     return render_template(
         "dashboard.html",
         window=window,
-        weight_chart=weight_chart,
-        weight_metrics=weight_metrics,
-        sleep_chart=sleep_chart,
-        sleep_metrics=sleep_metrics,
-        wake_chart=wake_chart,
-        wake_metrics=wake_metrics,
-        workout_chart=workout_chart,
-        workout_metrics=workout_metrics,
-        calorie_chart=calorie_chart,
-        calorie_metrics=calorie_metrics,
-        today_entries=today_entries,
-        today_calories=today_calories,
+        chart_layout=_CHART_LAYOUT_JSON,
+        **charts,
         presets=presets,
         food_count=food_count,
         pool_status=pool_status,
         pool_weekly=pool_weekly,
-        custom_charts=custom_charts,
         today=date.today().isoformat(),
     )
 
 
 # --- API Endpoints for Data Entry ---
 
+def _upsert_entry(model, key_columns: list[str], **values):
+    """
+    Insert an entry, or update the existing one with the same key columns.
+    
+    A single INSERT ... ON CONFLICT DO UPDATE statement, so there is no
+    read-then-write round trip. Updates also bump created_at so the
+    dashboard's auto-refresh notices the change.
+    """
+    stmt = sqlite_insert(model).values(**values)
+    updates = {
+        column: stmt.excluded[column]
+        for column in values
+        if column not in key_columns
+    }
+    updates["created_at"] = datetime.utcnow()
+    db.session.execute(stmt.on_conflict_do_update(index_elements=key_columns, set_=updates))
+
+
 @main_bp.route("/api/weight", methods=["POST"])
 def add_weight():
     """Add or update weight entry."""
     data = request.get_json()
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
+    entry_date = date.fromisoformat(data["date"])
     # Accept weight_lbs (preferred) or weight_kg for backwards compatibility
     weight_lbs = float(data.get("weight_lbs") or data.get("weight_kg", 0))
     
-    # Check for existing entry on this date
-    existing = WeightEntry.query.filter_by(date=entry_date).first()
-    if existing:
-        existing.weight_kg = weight_lbs  # Column stores lbs despite name
-        existing.created_at = datetime.utcnow()  # Update timestamp for auto-refresh
-    else:
-        entry = WeightEntry(date=entry_date, weight_kg=weight_lbs)  # Column stores lbs
-        db.session.add(entry)
+    # Column stores lbs despite name
+    _upsert_entry(WeightEntry, ["date"], date=entry_date, weight_kg=weight_lbs)
     
     db.session.commit()
     return jsonify({"status": "ok"})
@@ -310,16 +380,10 @@ def add_sleep():
     """Add or update sleep entry."""
     data = request.get_json()
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
+    entry_date = date.fromisoformat(data["date"])
     hours = float(data["hours"])
     
-    existing = SleepEntry.query.filter_by(date=entry_date).first()
-    if existing:
-        existing.hours = hours
-        existing.created_at = datetime.utcnow()  # Update timestamp for auto-refresh
-    else:
-        entry = SleepEntry(date=entry_date, hours=hours)
-        db.session.add(entry)
+    _upsert_entry(SleepEntry, ["date"], date=entry_date, hours=hours)
     
     db.session.commit()
     return jsonify({"status": "ok"})
@@ -330,16 +394,10 @@ def add_wake_time():
     """Add or update wake time entry."""
     data = request.get_json()
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
-    wake_time = datetime.strptime(data["wake_time"], "%H:%M:%S").time()
+    entry_date = date.fromisoformat(data["date"])
+    wake_time = time.fromisoformat(data["wake_time"])
     
-    existing = WakeTimeEntry.query.filter_by(date=entry_date).first()
-    if existing:
-        existing.wake_time = wake_time
-        existing.created_at = datetime.utcnow()  # Update timestamp for auto-refresh
-    else:
-        entry = WakeTimeEntry(date=entry_date, wake_time=wake_time)
-        db.session.add(entry)
+    _upsert_entry(WakeTimeEntry, ["date"], date=entry_date, wake_time=wake_time)
     
     db.session.commit()
     return jsonify({"status": "ok"})
@@ -350,7 +408,7 @@ def add_workout():
     """Add workout entry."""
     data = request.get_json()
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
+    entry_date = date.fromisoformat(data["date"])
     workout_type = data["workout_type"]
     duration = data.get("duration_minutes")
     notes = data.get("notes", "")
@@ -455,7 +513,7 @@ def add_calorie_entry():
     """Add a calorie entry."""
     data = request.get_json()
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
+    entry_date = date.fromisoformat(data["date"])
     calories = float(data["calories"])
     meal_name = data["meal_name"]
     
@@ -572,7 +630,7 @@ def log_preset(preset_id):
     preset = MealPreset.query.get_or_404(preset_id)
     data = request.get_json() or {}
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date() if data.get("date") else date.today()
+    entry_date = date.fromisoformat(data["date"]) if data.get("date") else date.today()
     
     entry = CalorieEntry(
         date=entry_date,
@@ -589,18 +647,66 @@ def log_preset(preset_id):
 
 # --- System Control API ---
 
+# Seconds a read of the mixer state is reused; the dashboard polls
+# /api/volume/state, and each read forks amixer
+VOLUME_STATE_TTL = 1.0
+
+# Last mixer read as (expires_at, (volume, muted)), or None
+_volume_state_cache: Optional[tuple] = None
+
+
+def _amixer_env() -> dict:
+    """Environment for ALSA/PulseAudio when run from the web server."""
+    env = os.environ.copy()
+    env["XDG_RUNTIME_DIR"] = f"/run/user/{os.getuid()}"
+    return env
+
+
+def _read_volume_state() -> tuple[int, bool]:
+    """Read (volume percent, muted) from amixer, reusing a recent read."""
+    global _volume_state_cache
+    import re
+    import subprocess
+    from time import monotonic
+    
+    now = monotonic()
+    if _volume_state_cache is not None and now < _volume_state_cache[0]:
+        return _volume_state_cache[1]
+    
+    result = subprocess.run(["amixer", "get", "Master"], 
+                           capture_output=True, text=True, env=_amixer_env())
+    if result.returncode != 0:
+        # Fallback with explicit card
+        result = subprocess.run(["amixer", "-c", "0", "get", "Master"],
+                               capture_output=True, text=True)
+    
+    muted = "[off]" in result.stdout
+    
+    # Parse volume percentage, e.g., "Playback 42598 [65%] [on]"
+    match = re.search(r'\[(\d+)%\]', result.stdout)
+    volume = int(match.group(1)) if match else 65
+    
+    _volume_state_cache = (now + VOLUME_STATE_TTL, (volume, muted))
+    return volume, muted
+
+
+def _invalidate_volume_state():
+    """Forget the cached mixer state after changing it."""
+    global _volume_state_cache
+    _volume_state_cache = None
+
+
 @main_bp.route("/api/volume/set", methods=["POST"])
 def set_volume():
     """Set system volume level (0-100)."""
     import subprocess
-    import os
     data = request.get_json()
     volume = data.get("volume", 50)
     volume = max(0, min(100, int(volume)))
     
     # Set up environment for ALSA/PulseAudio
-    env = os.environ.copy()
-    env["XDG_RUNTIME_DIR"] = f"/run/user/{os.getuid()}"
+    env = _amixer_env()
+    _invalidate_volume_state()
     
     try:
         # Try with environment first
@@ -621,10 +727,9 @@ def set_volume():
 def toggle_volume():
     """Toggle system volume mute state."""
     import subprocess
-    import os
     
-    env = os.environ.copy()
-    env["XDG_RUNTIME_DIR"] = f"/run/user/{os.getuid()}"
+    env = _amixer_env()
+    _invalidate_volume_state()
     
     try:
         # Toggle mute using amixer
@@ -632,9 +737,7 @@ def toggle_volume():
                       check=True, capture_output=True, env=env)
         
         # Check new state
-        result = subprocess.run(["amixer", "get", "Master"], 
-                               capture_output=True, text=True, env=env)
-        muted = "[off]" in result.stdout
+        _, muted = _read_volume_state()
         
         return jsonify({"status": "ok", "muted": muted})
     except subprocess.CalledProcessError:
@@ -642,9 +745,7 @@ def toggle_volume():
         try:
             subprocess.run(["amixer", "-c", "0", "set", "Master", "toggle"],
                           check=True, capture_output=True)
-            result = subprocess.run(["amixer", "-c", "0", "get", "Master"],
-                                   capture_output=True, text=True)
-            muted = "[off]" in result.stdout
+            _, muted = _read_volume_state()
             return jsonify({"status": "ok", "muted": muted})
         except Exception as e:
             return jsonify({"status": "error", "message": str(e), "muted": False})
@@ -653,27 +754,8 @@ def toggle_volume():
 @main_bp.route("/api/volume/state", methods=["GET"])
 def get_volume_state():
     """Get current volume level and mute state."""
-    import subprocess
-    import re
-    import os
-    
-    env = os.environ.copy()
-    env["XDG_RUNTIME_DIR"] = f"/run/user/{os.getuid()}"
-    
     try:
-        result = subprocess.run(["amixer", "get", "Master"], 
-                               capture_output=True, text=True, env=env)
-        if result.returncode != 0:
-            # Fallback with explicit card
-            result = subprocess.run(["amixer", "-c", "0", "get", "Master"],
-                                   capture_output=True, text=True)
-        
-        muted = "[off]" in result.stdout
-        
-        # Parse volume percentage, e.g., "Playback 42598 [65%] [on]"
-        match = re.search(r'\[(\d+)%\]', result.stdout)
-        volume = int(match.group(1)) if match else 65
-        
+        volume, muted = _read_volume_state()
         return jsonify({"volume": volume, "muted": muted})
     except:
         return jsonify({"volume": 65, "muted": False})
@@ -682,45 +764,41 @@ def get_volume_state():
 @main_bp.route("/api/sample-data", methods=["POST"])
 def load_sample_data():
     """Load sample data into the database."""
-    from datetime import timedelta
     import random
     
     try:
         today = date.today()
+        first_day = today - timedelta(days=29)
+        days = [today - timedelta(days=i) for i in range(30)]
+        
+        def insert_missing(model, make_row):
+            """Insert a sample row for each day without an entry in model yet."""
+            existing = {
+                d for (d,) in db.session.query(model.date).filter(model.date >= first_day)
+            }
+            rows = [make_row(d) for d in days if d not in existing]
+            if rows:
+                # One executemany INSERT, bypassing the ORM unit of work
+                db.session.execute(db.insert(model), rows)
         
         # Add sample weight entries (last 30 days)
-        for i in range(30):
-            entry_date = today - timedelta(days=i)
-            weight = 75 + random.uniform(-2, 2)
-            
-            existing = WeightEntry.query.filter_by(date=entry_date).first()
-            if not existing:
-                entry = WeightEntry(date=entry_date, weight_kg=round(weight, 1))
-                db.session.add(entry)
+        insert_missing(WeightEntry, lambda entry_date: {
+            "date": entry_date,
+            "weight_kg": round(75 + random.uniform(-2, 2), 1),
+        })
         
         # Add sample sleep entries
-        for i in range(30):
-            entry_date = today - timedelta(days=i)
-            hours = 7 + random.uniform(-1.5, 1.5)
-            
-            existing = SleepEntry.query.filter_by(date=entry_date).first()
-            if not existing:
-                entry = SleepEntry(date=entry_date, hours=round(hours, 1))
-                db.session.add(entry)
+        insert_missing(SleepEntry, lambda entry_date: {
+            "date": entry_date,
+            "hours": round(7 + random.uniform(-1.5, 1.5), 1),
+        })
         
         # Add sample calorie entries
-        for i in range(30):
-            entry_date = today - timedelta(days=i)
-            calories = 2000 + random.randint(-300, 300)
-            
-            existing = CalorieEntry.query.filter_by(date=entry_date).first()
-            if not existing:
-                entry = CalorieEntry(
-                    date=entry_date,
-                    meal_name="Sample meals",
-                    calories=calories
-                )
-                db.session.add(entry)
+        insert_missing(CalorieEntry, lambda entry_date: {
+            "date": entry_date,
+            "meal_name": "Sample meals",
+            "calories": 2000 + random.randint(-300, 300),
+        })
         
         db.session.commit()
         return jsonify({"status": "ok", "message": "Sample data loaded"})
@@ -738,18 +816,16 @@ def get_last_updated():
     
     Used by the dashboard to detect when to auto-refresh.
     """
-    # Check the most recent entry across all tables
-    latest = None
-    
-    # Check each table for the most recent created_at
-    for model in [WeightEntry, SleepEntry, WakeTimeEntry, WorkoutEntry, CalorieEntry, CustomMetricEntry]:
-        try:
-            entry = model.query.order_by(model.created_at.desc()).first()
-            if entry and entry.created_at:
-                if latest is None or entry.created_at > latest:
-                    latest = entry.created_at
-        except:
-            pass
+    # Most recent created_at across all tables in one statement; each
+    # MAX() is a seek on that table's created_at index
+    models = [WeightEntry, SleepEntry, WakeTimeEntry, WorkoutEntry, CalorieEntry, CustomMetricEntry]
+    latest_per_table = db.union_all(*(
+        db.select(db.func.max(model.created_at).label("created_at")) for model in models
+    )).subquery()
+    try:
+        latest = db.session.scalar(db.select(db.func.max(latest_per_table.c.created_at)))
+    except Exception:
+        latest = None
     
     if latest:
         return jsonify({"last_updated": latest.isoformat()})
@@ -835,27 +911,14 @@ def add_metric_entry(metric_id):
     metric = CustomMetric.query.get_or_404(metric_id)
     data = request.get_json()
     
-    entry_date = datetime.strptime(data["date"], "%Y-%m-%d").date()
+    entry_date = date.fromisoformat(data["date"])
     value = float(data["value"])
     
-    # Check for existing entry on this date
-    existing = CustomMetricEntry.query.filter_by(
-        metric_id=metric_id,
-        date=entry_date
-    ).first()
-    
-    if existing:
-        existing.value = value
-        existing.notes = data.get("notes", existing.notes)
-        existing.created_at = datetime.utcnow()  # Update timestamp for auto-refresh
-    else:
-        entry = CustomMetricEntry(
-            metric_id=metric_id,
-            date=entry_date,
-            value=value,
-            notes=data.get("notes"),
-        )
-        db.session.add(entry)
+    # Existing notes are kept unless the request sends new ones
+    values = {"value": value}
+    if "notes" in data:
+        values["notes"] = data["notes"]
+    _upsert_entry(CustomMetricEntry, ["metric_id", "date"], metric_id=metric_id, date=entry_date, **values)
     
     db.session.commit()
     return jsonify({"status": "ok"})
@@ -872,116 +935,114 @@ def delete_metric_entry(metric_id, entry_id):
 
 # --- CSV Export ---
 
-@main_bp.route("/export/weight")
-def export_weight():
-    """Export weight data as CSV."""
-    entries = WeightEntry.query.order_by(WeightEntry.date).all()
+# Rows are fetched in batches and CSV text is sent in chunks of about
+# this many characters, so exports stream in constant memory
+EXPORT_BATCH_ROWS = 1000
+EXPORT_CHUNK_SIZE = 8192
+
+
+def _export_rows(*columns):
+    """Yield the given columns of every entry, ordered by date, in batches."""
+    query = db.select(*columns).order_by(columns[0]).execution_options(yield_per=EXPORT_BATCH_ROWS)
+    return db.session.execute(query)
+
+
+def _weight_export_rows():
+    """Weight CSV rows."""
+    for d, weight_kg in _export_rows(WeightEntry.date, WeightEntry.weight_kg):
+        yield d.isoformat(), weight_kg
+
+
+def _sleep_export_rows():
+    """Sleep CSV rows."""
+    for d, hours in _export_rows(SleepEntry.date, SleepEntry.hours):
+        yield d.isoformat(), hours
+
+
+def _wake_export_rows():
+    """Wake time CSV rows."""
+    for d, wake_time in _export_rows(WakeTimeEntry.date, WakeTimeEntry.wake_time):
+        yield d.isoformat(), wake_time.strftime("%H:%M:%S")
+
+
+def _workout_export_rows():
+    """Workout CSV rows."""
+    columns = (WorkoutEntry.date, WorkoutEntry.workout_type, WorkoutEntry.duration_minutes, WorkoutEntry.notes)
+    for d, workout_type, duration_minutes, notes in _export_rows(*columns):
+        yield d.isoformat(), workout_type, duration_minutes or "", notes or ""
+
+
+def _csv_chunks(sections: list[tuple]):
+    """
+    Generate CSV text for (title, header, rows) sections.
     
+    A section with a title gets a "# title" line, and titled sections are
+    separated by a blank row.
+    """
     output = io.StringIO()
     writer = csv.writer(output)
-    writer.writerow(["date", "weight_kg"])
-    for e in entries:
-        writer.writerow([e.date.isoformat(), e.weight_kg])
     
+    for i, (title, header, rows) in enumerate(sections):
+        if title and i > 0:
+            writer.writerow([])
+        if title:
+            writer.writerow([title])
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            if output.tell() >= EXPORT_CHUNK_SIZE:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+    
+    yield output.getvalue()
+
+
+def _csv_response(sections: list[tuple], filename: str) -> Response:
+    """Stream CSV sections as a file download."""
     return Response(
-        output.getvalue(),
+        stream_with_context(_csv_chunks(sections)),
         mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=weight_export.csv"}
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
+@main_bp.route("/export/weight")
+def export_weight():
+    """Export weight data as CSV."""
+    return _csv_response([(None, ["date", "weight_kg"], _weight_export_rows())], "weight_export.csv")
+
+
 @main_bp.route("/export/sleep")
 def export_sleep():
     """Export sleep data as CSV."""
-    entries = SleepEntry.query.order_by(SleepEntry.date).all()
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["date", "hours"])
-    for e in entries:
-        writer.writerow([e.date.isoformat(), e.hours])
-    
-    return Response(
-        output.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=sleep_export.csv"}
-    )
+    return _csv_response([(None, ["date", "hours"], _sleep_export_rows())], "sleep_export.csv")
 
 
 @main_bp.route("/export/wake")
 def export_wake():
     """Export wake time data as CSV."""
-    entries = WakeTimeEntry.query.order_by(WakeTimeEntry.date).all()
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["date", "wake_time"])
-    for e in entries:
-        writer.writerow([e.date.isoformat(), e.wake_time.strftime("%H:%M:%S")])
-    
-    return Response(
-        output.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=wake_time_export.csv"}
-    )
+    return _csv_response([(None, ["date", "wake_time"], _wake_export_rows())], "wake_time_export.csv")
 
 
 @main_bp.route("/export/workout")
 def export_workout():
     """Export workout data as CSV."""
-    entries = WorkoutEntry.query.order_by(WorkoutEntry.date).all()
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["date", "workout_type", "duration_minutes", "notes"])
-    for e in entries:
-        writer.writerow([e.date.isoformat(), e.workout_type, e.duration_minutes or "", e.notes or ""])
-    
-    return Response(
-        output.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=workout_export.csv"}
+    return _csv_response(
+        [(None, ["date", "workout_type", "duration_minutes", "notes"], _workout_export_rows())],
+        "workout_export.csv",
     )
 
 
 @main_bp.route("/export/all")
 def export_all():
     """Export all data as a single CSV with multiple sections."""
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Weight section
-    writer.writerow(["# Weight Data"])
-    writer.writerow(["date", "weight_kg"])
-    for e in WeightEntry.query.order_by(WeightEntry.date).all():
-        writer.writerow([e.date.isoformat(), e.weight_kg])
-    writer.writerow([])
-    
-    # Sleep section
-    writer.writerow(["# Sleep Data"])
-    writer.writerow(["date", "hours"])
-    for e in SleepEntry.query.order_by(SleepEntry.date).all():
-        writer.writerow([e.date.isoformat(), e.hours])
-    writer.writerow([])
-    
-    # Wake time section
-    writer.writerow(["# Wake Time Data"])
-    writer.writerow(["date", "wake_time"])
-    for e in WakeTimeEntry.query.order_by(WakeTimeEntry.date).all():
-        writer.writerow([e.date.isoformat(), e.wake_time.strftime("%H:%M:%S")])
-    writer.writerow([])
-    
-    # Workout section
-    writer.writerow(["# Workout Data"])
-    writer.writerow(["date", "workout_type", "duration_minutes", "notes"])
-    for e in WorkoutEntry.query.order_by(WorkoutEntry.date).all():
-        writer.writerow([e.date.isoformat(), e.workout_type, e.duration_minutes or "", e.notes or ""])
-    
-    return Response(
-        output.getvalue(),
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=health_data_export.csv"}
-    )
+    return _csv_response([
+        ("# Weight Data", ["date", "weight_kg"], _weight_export_rows()),
+        ("# Sleep Data", ["date", "hours"], _sleep_export_rows()),
+        ("# Wake Time Data", ["date", "wake_time"], _wake_export_rows()),
+        ("# Workout Data", ["date", "workout_type", "duration_minutes", "notes"], _workout_export_rows()),
+    ], "health_data_export.csv")
 
 
 # =============================================================================
@@ -991,49 +1052,22 @@ def export_all():
 @main_bp.route("/api/alarm/config", methods=["GET"])
 def get_alarm_config():
     """Get current alarm configuration."""
-    from pathlib import Path
-    import json
-    
-    config_file = Path(__file__).parent.parent / "data" / "alarm_config.json"
-    default_config = {
-        "enabled": True,
-        "time": "08:00",
-        "days": ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-    }
+    from alarm.scheduler import load_config
     
-    if not config_file.exists():
-        return jsonify(default_config)
-    
-    try:
-        with open(config_file, "r") as f:
-            config = json.load(f)
-        return jsonify({**default_config, **config})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Shared with the alarm daemon; cached until the file changes
+    return jsonify(load_config())
 
 
 @main_bp.route("/api/alarm/config", methods=["POST"])
 def set_alarm_config():
     """Update alarm configuration."""
-    from pathlib import Path
-    import json
+    from alarm.scheduler import load_config, save_config
     import re
     
-    config_file = Path(__file__).parent.parent / "data" / "alarm_config.json"
     data = request.get_json()
     
-    # Load existing config
-    existing = {
-        "enabled": True,
-        "time": "08:00",
-        "days": ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-    }
-    if config_file.exists():
-        try:
-            with open(config_file, "r") as f:
-                existing = {**existing, **json.load(f)}
-        except Exception:
-            pass
+    # Load existing config (defaults merged in)
+    existing = load_config()
     
     # Update with new values
     if "enabled" in data:
@@ -1052,13 +1086,8 @@ def set_alarm_config():
         existing["days"] = days
     
     # Save config
-    try:
-        config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_file, "w") as f:
-            json.dump(existing, f, indent=2)
-            f.write("\n")
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if not save_config(existing):
+        return jsonify({"error": "Failed to save alarm config"}), 500
     
     return jsonify({"status": "ok", "config": existing})
 
@@ -1066,14 +1095,11 @@ def set_alarm_config():
 @main_bp.route("/api/alarm/stop", methods=["POST"])
 def stop_alarm():
     """Stop the currently playing alarm music."""
-    import subprocess
+    from alarm.player import stop_playback
     
     try:
-        # Find and kill mpv processes started by alarm
-        # Use pkill to kill all mpv processes (simplest approach)
-        result = subprocess.run(["pkill", "-f", "mpv.*music"], capture_output=True)
-        
-        if result.returncode == 0:
+        # The alarm service keeps mpv running idle; stop it over IPC
+        if stop_playback():
             return jsonify({"status": "ok", "message": "Alarm stopped"})
         else:
             return jsonify({"status": "ok", "message": "No alarm was playing"})
@@ -1084,16 +1110,10 @@ def stop_alarm():
 @main_bp.route("/api/alarm/status", methods=["GET"])
 def get_alarm_status():
     """Check if alarm music is currently playing."""
-    import subprocess
+    from alarm.player import is_playing
     
     try:
-        # Check if mpv is running with music directory
-        result = subprocess.run(
-            ["pgrep", "-f", "mpv.*music"],
-            capture_output=True
-        )
-        is_playing = result.returncode == 0
-        
-        return jsonify({"playing": is_playing})
+        # Ask the alarm service's mpv whether it has a playlist loaded
+        return jsonify({"playing": is_playing()})
     except Exception:
         return jsonify({"playing": False})
@@ -27,7 +27,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.food_db import init_food_db, get_food_db_connection
+from app.food_db import init_food_db, get_food_db_connection, bulk_food_load
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 FOOD_DB_PATH = DATA_DIR / "foods.db"
@@ -144,18 +144,6 @@ def import_to_sqlite(temp_dir: str, limit: int = None, keep_existing: bool = Fal
     # Nutrient IDs
     NUTRIENT_ENERGY = 1008  # kcal per 100g
     
-    # Initialize database with new schema
-    init_food_db()
-    
-    conn = get_food_db_connection()
-    cursor = conn.cursor()
-    
-    if not keep_existing:
-        print("Clearing existing data...")
-        cursor.execute("DELETE FROM food_aliases")
-        cursor.execute("DELETE FROM foods")
-        conn.commit()
-    
     # Collect foods with calorie data
     print("Reading food data...")
     foods_to_import = []
@@ -198,33 +186,48 @@ def import_to_sqlite(temp_dir: str, limit: int = None, keep_existing: bool = Fal
     imported = 0
     aliases_added = 0
     
-    for food in foods_to_import:
-        # Insert food
-        cursor.execute("""
-            INSERT INTO foods (fdc_id, name, calories_per_unit, unit_type, canonical_unit, category)
-            VALUES (?, ?, ?, 'mass', 'g', ?)
-        """, (food['fdc_id'], food['name'], food['calories_per_unit'], food['category']))
+    # Initialize database with new schema
+    init_food_db()
+    
+    # The search index and food count are rebuilt once after the import
+    # instead of being updated by triggers for every row
+    with bulk_food_load():
+        conn = get_food_db_connection()
+        cursor = conn.cursor()
         
-        food_id = cursor.lastrowid
+        if not keep_existing:
+            print("Clearing existing data...")
+            cursor.execute("DELETE FROM food_aliases")
+            cursor.execute("DELETE FROM foods")
+            conn.commit()
         
-        # Generate and insert aliases
-        aliases = generate_simple_aliases(food['name'])
-        for alias in aliases:
-            try:
-                cursor.execute("""
-                    INSERT INTO food_aliases (food_id, alias) VALUES (?, ?)
-                """, (food_id, alias))
-                aliases_added += 1
-            except sqlite3.IntegrityError:
-                pass  # Duplicate alias
+        for food in foods_to_import:
+            # Insert food
+            cursor.execute("""
+                INSERT INTO foods (fdc_id, name, calories_per_unit, unit_type, canonical_unit, category)
+                VALUES (?, ?, ?, 'mass', 'g', ?)
+            """, (food['fdc_id'], food['name'], food['calories_per_unit'], food['category']))
+            
+            food_id = cursor.lastrowid
+            
+            # Generate and insert aliases
+            aliases = generate_simple_aliases(food['name'])
+            for alias in aliases:
+                try:
+                    cursor.execute("""
+                        INSERT INTO food_aliases (food_id, alias) VALUES (?, ?)
+                    """, (food_id, alias))
+                    aliases_added += 1
+                except sqlite3.IntegrityError:
+                    pass  # Duplicate alias
+            
+            imported += 1
+            if imported % 500 == 0:
+                print(f"\rImported {imported} foods...", end="", flush=True)
+                conn.commit()
         
-        imported += 1
-        if imported % 500 == 0:
-            print(f"\rImported {imported} foods...", end="", flush=True)
-            conn.commit()
-    
-    conn.commit()
-    conn.close()
+        conn.commit()
+        conn.close()
     
     print(f"\n\nImport complete!")
     print(f"  - Imported: {imported} foods")